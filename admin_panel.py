@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+import api_client
 import pandas as pd
 from datetime import datetime
 from requests.exceptions import RequestException
@@ -10,14 +10,10 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-API_URL = "http://127.0.0.1:8090"
+API_URL = api_client.API_URL
 
 def check_server():
-    try:
-        response = requests.get(f"{API_URL}/docs", timeout=2)
-        return response.status_code == 200
-    except:
-        return False
+    return api_client.check_server()
 
 def login():
     st.title("Admin Login")
@@ -35,34 +31,25 @@ def login():
     if st.button("Login"):
         try:
             with st.spinner("Logging in..."):
-                logger.info(f"Attempting login with username: {username}")
-                
-                # Debug: Print request details
-                logger.info(f"Sending request to: {API_URL}/token")
-                logger.info(f"Request data: username={username}")
-                
-                response = requests.post(
-                    f"{API_URL}/token",
-                    data={"username": username, "password": password},
-                    timeout=5
-                )
-                
-                # Debug: Print response details
-                logger.info(f"Response status code: {response.status_code}")
-                logger.info(f"Response headers: {response.headers}")
-                logger.info(f"Response content: {response.text}")
+                logger.info("Attempting login with username: %s", username)
+                response = api_client.login(username, password)
+                # Never log the response body or headers: they carry the access token
+                logger.info("Login response status code: %s", response.status_code)
                 
                 if response.status_code == 200:
                     st.session_state["token"] = response.json()["access_token"]
                     st.success("Successfully logged in!")
                     time.sleep(1)
                     st.experimental_rerun()
+                elif response.status_code in (429, 503):
+                    retry_after = response.headers.get("Retry-After", "a few")
+                    st.error(f"Too many login attempts or server busy. Try again in {retry_after} seconds.")
                 else:
                     st.error("Invalid credentials")
-                    logger.warning(f"Login failed. Status code: {response.status_code}")
+                    logger.warning("Login failed. Status code: %s", response.status_code)
         except RequestException as e:
             st.error("Could not connect to the backend server. Please make sure it's running.")
-            logger.error(f"Connection error: {str(e)}")
+            logger.error("Connection error: %s", e)
             if st.button("Retry"):
                 st.experimental_rerun()
 
@@ -70,59 +57,66 @@ def show_dashboard():
     st.title("Resume Builder Admin Dashboard")
     
     try:
-        # Get stats
-        headers = {"Authorization": f"Bearer {st.session_state['token']}"}
-        
         with st.spinner("Loading dashboard..."):
-            stats_response = requests.get(f"{API_URL}/admin/stats", headers=headers, timeout=5)
+            # Stats, users and resumes come from one cached, ETag-revalidated request
+            dashboard = api_client.get_dashboard(st.session_state["token"])
+            stats = dashboard["stats"]
             
-            if stats_response.status_code == 200:
-                stats = stats_response.json()
-                
-                # Display metrics in a nice layout
-                st.markdown("### 📊 Overview")
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("👥 Total Users", stats["total_users"])
-                with col2:
-                    st.metric("📄 Total Resumes", stats["total_resumes"])
-                with col3:
-                    st.metric("⬇️ Total Downloads", stats["total_downloads"])
-                
-                # Show users
-                st.markdown("### 👥 Recent Users")
-                users_response = requests.get(f"{API_URL}/admin/users", headers=headers, timeout=5)
-                if users_response.status_code == 200:
-                    users = users_response.json()
-                    if users:
-                        users_df = pd.DataFrame(users)
-                        users_df["created_at"] = pd.to_datetime(users_df["created_at"]).dt.strftime("%Y-%m-%d %H:%M")
-                        st.dataframe(users_df[["name", "email", "title", "created_at"]], use_container_width=True)
-                    else:
-                        st.info("No users found")
-                
-                # Show resumes
-                st.markdown("### 📄 Recent Resumes")
-                resumes_response = requests.get(f"{API_URL}/admin/resumes", headers=headers, timeout=5)
-                if resumes_response.status_code == 200:
-                    resumes = resumes_response.json()
-                    if resumes:
-                        resumes_df = pd.DataFrame(resumes)
-                        resumes_df["created_at"] = pd.to_datetime(resumes_df["created_at"]).dt.strftime("%Y-%m-%d %H:%M")
-                        st.dataframe(resumes_df[["id", "template_style", "score", "downloaded_count", "created_at"]], use_container_width=True)
-                    else:
-                        st.info("No resumes found")
-                        
-            elif stats_response.status_code == 401:
-                st.error("Session expired. Please login again.")
-                del st.session_state["token"]
-                st.experimental_rerun()
+            # Display metrics in a nice layout
+            st.markdown("### 📊 Overview")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("👥 Total Users", stats["total_users"])
+            with col2:
+                st.metric("📄 Total Resumes", stats["total_resumes"])
+            with col3:
+                st.metric("⬇️ Total Downloads", stats["total_downloads"])
+            
+            # Show users
+            st.markdown("### 👥 Recent Users")
+            users = dashboard["users"]
+            if users:
+                users_df = pd.DataFrame(users)
+                users_df["created_at"] = pd.to_datetime(users_df["created_at"]).dt.strftime("%Y-%m-%d %H:%M")
+                st.dataframe(users_df[["name", "email", "title", "created_at"]], use_container_width=True)
+            else:
+                st.info("No users found")
+            
+            # Show resumes
+            st.markdown("### 📄 Recent Resumes")
+            resumes = dashboard["resumes"]
+            if resumes:
+                resumes_df = pd.DataFrame(resumes)
+                resumes_df["created_at"] = pd.to_datetime(resumes_df["created_at"]).dt.strftime("%Y-%m-%d %H:%M")
+                st.dataframe(resumes_df[["id", "template_style", "score", "downloaded_count", "created_at"]], use_container_width=True)
             else:
-                st.error(f"Error fetching data: {stats_response.status_code}")
+                st.info("No resumes found")
+        
+        # Bulk export, streamed by the API instead of paged into DataFrames
+        st.markdown("### 📦 Export Data")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            export_table = st.selectbox("Table", ["users", "resumes"])
+        with col2:
+            export_format = st.selectbox("Format", ["csv", "ndjson", "parquet"])
+        with col3:
+            export_gzip = st.checkbox("Gzip", value=True)
+        if st.button("Prepare Export"):
+            # The browser downloads straight from the streaming endpoint; nothing passes through Streamlit
+            url = api_client.export_link(st.session_state["token"], export_table, export_format, export_gzip)
+            st.markdown(f"[⬇️ Download {export_table} export]({url}) (link expires in a few minutes)")
                 
+    except api_client.APIError as e:
+        if e.status_code == 401:
+            st.error("Session expired. Please login again.")
+            api_client.forget_token(st.session_state["token"])
+            del st.session_state["token"]
+            st.experimental_rerun()
+        else:
+            st.error(f"Error fetching data: {e.status_code}")
     except RequestException as e:
         st.error("Could not connect to the backend server. Please make sure it's running.")
-        logger.error(f"Connection error: {str(e)}")
+        logger.error("Connection error: %s", e)
         if st.button("Retry"):
             st.experimental_rerun()
 
@@ -135,6 +129,7 @@ def main():
     else:
         show_dashboard()
         if st.sidebar.button("Logout"):
+            api_client.forget_token(st.session_state["token"])
             del st.session_state["token"]
             st.experimental_rerun()
 
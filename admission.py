@@ -0,0 +1,308 @@
+"""Admission control for expensive endpoints.
+
+Each endpoint class (PDF rendering, password hashing) gets a fixed number
+of concurrent slots and a bounded wait queue. A request that finds the
+queue full, or waits longer than the queue timeout, is answered at once
+with 503 and a Retry-After estimate instead of piling up until the client
+gives up. Per-client token buckets answer 429 to a single client sending
+faster than its rate. Request bodies over MAX_BODY_BYTES are answered
+with 413 while they stream in, before any of them is parsed.
+
+Slots are per worker process; by default each worker gets its share of
+the CPUs (cpu_count // WEB_CONCURRENCY), so the server as a whole renders
+about one resume per CPU. A client's requests land on any worker, so the
+token buckets are kept in the SQLite file RATE_LIMIT_DB when it is set
+(the production launchers set it) and shared by all workers; without it
+each process keeps its own.
+"""
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+import asyncio
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from fastapi import HTTPException
+
+from metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_WAIT
+
+logger = logging.getLogger(__name__)
+
+CPU_COUNT = os.cpu_count() or 1
+# Set by both production launchers to the number of workers they start
+WORKER_COUNT = max(1, int(os.getenv("WEB_CONCURRENCY") or "1"))
+WORKER_CPU_SHARE = max(1, CPU_COUNT // WORKER_COUNT)
+MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", str(256 * 1024)))
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB")
+
+
+class ConcurrencyLimiter:
+    """At most `limit` holders at a time, at most `queue_size` waiting for a slot"""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters = deque()
+        # Moving average of how long a slot is held, for Retry-After
+        self._hold_time = 1.0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._hold_time * (self.waiting + 1) / self.limit))
+
+    def _reject(self, reason: str) -> HTTPException:
+        ADMISSION_REJECTED.inc(self.name, reason)
+        logger.warning("Rejected %s request (%s): %d active, %d waiting", self.name, reason, self.active, self.waiting)
+        return HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(self.retry_after())}
+        )
+
+    async def acquire(self):
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUE_DEPTH.set(self.name, value=self.waiting)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            # Client went away; hand over a slot we may already have been given
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            ADMISSION_QUEUE_DEPTH.set(self.name, value=self.waiting)
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Pass the slot straight to the oldest waiter; `active` is unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        start = time.perf_counter()
+        await self.acquire()
+        admitted = time.perf_counter()
+        ADMISSION_WAIT.observe(self.name, value=admitted - start)
+        ADMISSION_IN_FLIGHT.inc(self.name)
+        try:
+            yield
+        finally:
+            ADMISSION_IN_FLIGHT.dec(self.name)
+            self._hold_time = 0.8 * self._hold_time + 0.2 * (time.perf_counter() - admitted)
+            self.release()
+
+
+def _take_token(state: Optional[Tuple[float, float]], now: float, rate: float, burst: int) -> Tuple[float, float]:
+    """Refill a bucket and take a token if there is one; returns (tokens before taking, tokens after)"""
+    tokens, updated_at = state or (burst, now)
+    tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+    return tokens, tokens - 1 if tokens >= 1 else tokens
+
+
+class SharedBuckets:
+    """Token buckets in an SQLite file, so every worker process draws from the same bucket"""
+
+    def __init__(self, path: str, timeout: float = 1.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._checks = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly below
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Losing the last moments of rate state in a crash is harmless
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (name TEXT, key TEXT, tokens REAL, updated_at REAL, "
+                "PRIMARY KEY (name, key)) WITHOUT ROWID"
+            )
+        return conn
+
+    def take(self, name: str, key: str, rate: float, burst: int) -> float:
+        conn = self._connection()
+        now = time.time()
+        # Taking the write lock up front serializes workers drawing from the same bucket
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE name = ? AND key = ?", (name, key)
+            ).fetchone()
+            tokens, left = _take_token(state, now, rate, burst)
+            conn.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)", (name, key, left, now))
+            self._checks += 1
+            if self._checks % 1000 == 0:
+                # Buckets that have refilled completely are the same as no entry
+                conn.execute("DELETE FROM buckets WHERE name = ? AND updated_at < ?", (name, now - burst / rate))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return tokens
+
+
+class RateLimiter:
+    """Token bucket per client key: `burst` requests at once, refilled at `per_minute`"""
+
+    def __init__(self, name: str, per_minute: float, burst: int, max_clients: int = 100_000,
+                 shared_path: Optional[str] = RATE_LIMIT_DB):
+        self.name = name
+        self.rate = per_minute / 60
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._shared = SharedBuckets(shared_path) if shared_path else None
+
+    def _take(self, key: str) -> float:
+        if self._shared is not None:
+            try:
+                return self._shared.take(self.name, key, self.rate, self.burst)
+            except sqlite3.Error as e:
+                # Never turn clients away because the limiter itself failed
+                logger.warning("Shared %s rate limit unavailable, admitting request: %s", self.name, e)
+                return self.burst
+        now = time.monotonic()
+        tokens, left = _take_token(self._buckets.pop(key, None), now, self.rate, self.burst)
+        self._buckets[key] = (left, now)
+        if len(self._buckets) > self.max_clients:
+            # Least recently seen client; a full bucket is the same as no entry
+            self._buckets.popitem(last=False)
+        return tokens
+
+    def check(self, key: str):
+        """Take one token for `key` or raise 429; a rate of 0 disables the limit"""
+        if self.rate <= 0:
+            return
+        tokens = self._take(key)
+        if tokens < 1:
+            ADMISSION_REJECTED.inc(self.name, "rate_limited")
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": str(max(1, math.ceil((1 - tokens) / self.rate)))}
+            )
+
+
+def client_address(request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware answering 413 to request bodies larger than `max_bytes`.
+
+    A declared Content-Length over the limit is rejected before anything is
+    read. Otherwise bytes are counted as they arrive, and the request is cut
+    off as soon as it crosses the limit, so a body is never buffered past it.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_BODY_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def _reject(self, send):
+        ADMISSION_REJECTED.inc("body", "too_large")
+        logger.warning("Rejected request body over %d bytes", self.max_bytes)
+        body = json.dumps({"detail": f"Request body exceeds {self.max_bytes} bytes"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    rejected = True
+                    await self._reject(send)
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # The app may still try to answer the body it could not read
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+
+RENDER = ConcurrencyLimiter(
+    "render",
+    limit=int(os.getenv("RENDER_CONCURRENCY", str(WORKER_CPU_SHARE))),
+    queue_size=int(os.getenv("RENDER_QUEUE_SIZE", "64")),
+    # Well below the 30 s the frontend waits for /generate_resume
+    queue_timeout=float(os.getenv("RENDER_QUEUE_TIMEOUT", "10")),
+)
+AUTH = ConcurrencyLimiter(
+    "auth",
+    limit=int(os.getenv("AUTH_CONCURRENCY", str(WORKER_CPU_SHARE))),
+    queue_size=int(os.getenv("AUTH_QUEUE_SIZE", "32")),
+    # The admin panel gives up on /token after 5 s
+    queue_timeout=float(os.getenv("AUTH_QUEUE_TIMEOUT", "3")),
+)
+
+RENDER_RATE = RateLimiter(
+    "render",
+    per_minute=float(os.getenv("RENDER_RATE_PER_MINUTE", "20")),
+    burst=int(os.getenv("RENDER_RATE_BURST", "5")),
+)
+AUTH_RATE = RateLimiter(
+    "auth",
+    per_minute=float(os.getenv("AUTH_RATE_PER_MINUTE", "10")),
+    burst=int(os.getenv("AUTH_RATE_BURST", "5")),
+)
@@ -0,0 +1,122 @@
+"""Shared HTTP client for the Streamlit apps.
+
+All calls go through one pooled `requests.Session`, so connections to the
+API are reused across Streamlit reruns. Read endpoints are memoized with
+`st.cache_data` for a short TTL.
+"""
+import os
+import logging
+from typing import Optional
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+API_URL = os.getenv("API_URL", "http://127.0.0.1:8090")
+# Where users' browsers reach the API, for download links
+PUBLIC_API_URL = os.getenv("PUBLIC_API_URL", API_URL)
+RESUMES_CACHE_TTL = int(os.getenv("RESUMES_CACHE_TTL", "30"))
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "10"))
+
+
+class APIError(Exception):
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"{status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """One keep-alive session per Streamlit server process"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _auth(token: Optional[str]) -> dict:
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def check_server() -> bool:
+    try:
+        return get_session().get(f"{API_URL}/healthz", timeout=2).status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+
+def login(username: str, password: str) -> requests.Response:
+    return get_session().post(
+        f"{API_URL}/token",
+        data={"username": username, "password": password},
+        timeout=5
+    )
+
+
+def generate_resume(resume_data: dict) -> requests.Response:
+    response = get_session().post(f"{API_URL}/generate_resume", json=resume_data, timeout=30)
+    if response.status_code == 200:
+        # The user's history just changed
+        get_user_resumes.clear()
+    return response
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def preview_resume(resume_data: dict) -> str:
+    """HTML preview of unsaved form data; identical input is served from the cache"""
+    response = get_session().post(f"{API_URL}/preview_resume", json=resume_data, timeout=10)
+    if response.status_code != 200:
+        raise APIError(response.status_code, response.text)
+    return response.text
+
+
+@st.cache_data(ttl=RESUMES_CACHE_TTL, show_spinner=False)
+def get_user_resumes(email: str) -> list:
+    response = get_session().get(f"{API_URL}/user/resumes", params={"email": email}, timeout=10)
+    if response.status_code != 200:
+        raise APIError(response.status_code, response.text)
+    return response.json()
+
+
+# token -> (etag, dashboard) of the last full response, for If-None-Match revalidation
+_dashboard_etags = {}
+
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False)
+def get_dashboard(token: str) -> dict:
+    headers = _auth(token)
+    cached = _dashboard_etags.get(token)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    response = get_session().get(f"{API_URL}/admin/dashboard", headers=headers, timeout=5)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    if response.status_code != 200:
+        raise APIError(response.status_code, response.text)
+    dashboard = response.json()
+    if response.headers.get("ETag"):
+        _dashboard_etags[token] = (response.headers["ETag"], dashboard)
+    return dashboard
+
+
+def export_link(token: str, table: str, fmt: str = "csv", compress: bool = True) -> str:
+    """Short-lived URL the browser downloads an export from, streamed straight from the API"""
+    response = get_session().post(
+        f"{API_URL}/admin/export/{table}/link",
+        params={"format": fmt, "gzip": str(compress).lower()},
+        headers=_auth(token),
+        timeout=5
+    )
+    if response.status_code != 200:
+        raise APIError(response.status_code, response.text)
+    return f"{PUBLIC_API_URL}{response.json()['url']}"
+
+
+def forget_token(token: str):
+    """Drop cached dashboard data for a token that is no longer used"""
+    _dashboard_etags.pop(token, None)
+    get_dashboard.clear()
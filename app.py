@@ -1,33 +1,49 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Form, File, UploadFile
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, text
 from datetime import datetime, timedelta
 from typing import List, Optional
+import hashlib
+import json
+import shutil
+import threading
+import time
+import uuid
+import weakref
+from urllib.parse import urlencode
 import jwt
-from passlib.context import CryptContext
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 import os
 import logging
-import aiofiles
-from database import get_db, Admin, User, Resume
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from fpdf import FPDF
+import log_config
+from database import get_db, engine, init_db, SessionLocal, Admin, User, Resume
+from metrics import METRICS_DIR, REGISTRY, MetricsMiddleware, PIPELINE_STAGE, PDF_SIZE, instrument_engine, prepare_multiprocess_dir
+import admission
+import profiling
+import export
+import preview
+import resume_store
+import search_index
+from resume_layout import resume_layout
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
+# Per-request info logs, sampled by LOG_SAMPLE_RATES (app.requests by default)
+request_logger = logger.getChild("requests")
 
 # Initialize FastAPI app
 app = FastAPI(title="Resume Builder API")
 
+# Innermost, so a 413 still gets CORS headers, metrics and a request id
+app.add_middleware(admission.BodySizeLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -36,14 +52,34 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+# Outermost, so the metrics and every handler log under the request's id
+app.add_middleware(log_config.RequestIdMiddleware)
+instrument_engine(engine)
 
 # Security
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Signed export links go in a URL, so they are short-lived and scoped to one table
+EXPORT_LINK_EXPIRE_MINUTES = int(os.getenv("EXPORT_LINK_EXPIRE_MINUTES", "5"))
+
+# Per-field limits on submitted resumes; the body as a whole is capped by MAX_BODY_BYTES
+MAX_FIELD_CHARS = int(os.getenv("MAX_FIELD_CHARS", "512"))
+MAX_SECTION_CHARS = int(os.getenv("MAX_SECTION_CHARS", "32768"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Admin dashboard
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "5"))
+_dashboard_cache = {}  # limit -> (expires_at, etag, body)
+
+_pwd_context = None
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+# Opt-in request profiling, not installed at all unless enabled
+if profiling.PROFILING_ENABLED:
+    # is_admin_token is defined with the other auth helpers below
+    app.add_middleware(profiling.ProfilingMiddleware, authorize=lambda token: is_admin_token(token))
 
 # Static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -69,6 +105,7 @@ class AdminResponse(AdminBase):
     
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class UserBase(BaseModel):
     name: str
@@ -87,6 +124,7 @@ class UserResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class ResumeBase(BaseModel):
     template_style: str
@@ -107,35 +145,44 @@ class ResumeResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class ResumeRequest(BaseModel):
     # User info
-    name: str
+    name: str = Field(..., max_length=MAX_FIELD_CHARS)
     email: EmailStr
-    title: str = "Professional"
-    phone: str = ""
-    location: str = ""
-    website: str = ""
-    linkedin: str = ""
-    github: str = ""
-    summary: str = ""
-    experience: str = ""
-    education: str = ""
-    skills: str = ""
-    languages: str = ""
-    certificates: str = ""
+    title: str = Field("Professional", max_length=MAX_FIELD_CHARS)
+    phone: str = Field("", max_length=MAX_FIELD_CHARS)
+    location: str = Field("", max_length=MAX_FIELD_CHARS)
+    website: str = Field("", max_length=MAX_FIELD_CHARS)
+    linkedin: str = Field("", max_length=MAX_FIELD_CHARS)
+    github: str = Field("", max_length=MAX_FIELD_CHARS)
+    summary: str = Field("", max_length=MAX_SECTION_CHARS)
+    experience: str = Field("", max_length=MAX_SECTION_CHARS)
+    education: str = Field("", max_length=MAX_SECTION_CHARS)
+    skills: str = Field("", max_length=MAX_SECTION_CHARS)
+    languages: str = Field("", max_length=MAX_SECTION_CHARS)
+    certificates: str = Field("", max_length=MAX_SECTION_CHARS)
     
     # Resume info
-    template_style: str
+    template_style: str = Field(..., max_length=MAX_FIELD_CHARS)
     score: int = 0
-    pdf_path: str = ""
+    pdf_path: str = Field("", max_length=MAX_FIELD_CHARS)
 
 # Helper functions
+def get_pwd_context():
+    # passlib and its bcrypt backend are only needed once someone logs in
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -147,6 +194,25 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def is_admin_token(token: str) -> bool:
+    """Authorizer for the profiling middleware: an unscoped token of an existing admin.
+
+    Only called for requests asking to be profiled, so the lookup costs
+    nothing on ordinary traffic.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        return False
+    # Same rule as get_current_admin: export links never act as bearer tokens
+    if not payload.get("sub") or payload.get("scope"):
+        return False
+    db = SessionLocal()
+    try:
+        return db.query(Admin.id).filter(Admin.username == payload["sub"]).first() is not None
+    finally:
+        db.close()
+
 def authenticate_admin(username: str, password: str, db: Session):
     admin = db.query(Admin).filter(Admin.username == username).first()
     if not admin:
@@ -164,7 +230,8 @@ async def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = D
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        # Scoped tokens (export links) only open the one endpoint they were made for
+        if username is None or payload.get("scope"):
             raise credentials_exception
         token_data = TokenData(username=username)
     except jwt.PyJWTError:
@@ -174,8 +241,35 @@ async def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = D
         raise credentials_exception
     return admin
 
-def calculate_resume_score(resume: ResumeRequest) -> int:
-    """Calculate a score for the resume based on content completeness and quality"""
+async def get_export_admin(
+    table: str,
+    link: Optional[str] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """Admin from the Authorization header, or from a signed `link` token for this table"""
+    if token or not link:
+        return await get_current_admin(token, db)
+    try:
+        payload = jwt.decode(link, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        payload = {}
+    admin = None
+    if payload.get("scope") == f"export:{table}":
+        admin = db.query(Admin).filter(Admin.username == payload.get("sub")).first()
+    if admin is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Export link is invalid or expired")
+    return admin
+
+def calculate_resume_score(resume: ResumeRequest, layout: Optional[dict] = None) -> int:
+    """Calculate a score for the resume based on content completeness and quality.
+
+    Sections are counted from `layout` (see `resume_layout.resume_layout`),
+    so a caller that also renders the resume splits each section only once.
+    """
+    if layout is None:
+        layout = resume_layout(resume)
+    sections = {section["field"]: section for section in layout["sections"]}
     score = 0
     
     # Basic information (30 points)
@@ -187,181 +281,75 @@ def calculate_resume_score(resume: ResumeRequest) -> int:
     if any([resume.website, resume.linkedin, resume.github]): score += 5
     
     # Professional Summary (10 points)
-    if resume.summary and len(resume.summary.split()) >= 30:
-        score += 10
-    elif resume.summary:
-        score += 5
+    if "summary" in sections:
+        # Stop counting words once there are enough
+        words = 0
+        for line in sections["summary"]["lines"]:
+            words += len(line.split())
+            if words >= 30:
+                break
+        score += 10 if words >= 30 else 5
     
     # Experience (25 points)
-    if resume.experience:
-        exp_lines = resume.experience.strip().split('\n')
-        score += min(len(exp_lines) * 5, 25)
+    if "experience" in sections:
+        score += min(sections["experience"]["line_count"] * 5, 25)
     
     # Education (15 points)
-    if resume.education:
-        edu_lines = resume.education.strip().split('\n')
-        score += min(len(edu_lines) * 5, 15)
+    if "education" in sections:
+        score += min(sections["education"]["line_count"] * 5, 15)
     
     # Skills (10 points)
-    if resume.skills:
-        skills_list = [s.strip() for s in resume.skills.split(',')]
-        score += min(len(skills_list), 10)
+    if "skills" in sections:
+        score += min(len(sections["skills"]["items"]), 10)
     
     # Languages (5 points)
-    if resume.languages:
-        languages_list = resume.languages.split(',')
-        score += min(len(languages_list) * 2, 5)
+    if "languages" in sections:
+        score += min(len(sections["languages"]["items"]) * 2, 5)
     
     # Certificates (5 points)
-    if resume.certificates:
-        cert_lines = resume.certificates.strip().split('\n')
-        score += min(len(cert_lines) * 2, 5)
+    if "certificates" in sections:
+        score += min(sections["certificates"]["line_count"] * 2, 5)
     
     return min(score, 100)
 
-def generate_pdf_resume(resume: ResumeRequest, output_path: str):
-    """Generate a PDF resume using FPDF"""
-    from fpdf import FPDF
-    
-    # Create PDF object
-    pdf = FPDF()
-    pdf.add_page()
-    
-    # Set colors based on template
-    colors = {
-        "modern": {"primary": (44, 62, 80), "secondary": (52, 152, 219)},
-        "professional": {"primary": (52, 73, 94), "secondary": (46, 204, 113)},
-        "creative": {"primary": (142, 68, 173), "secondary": (231, 76, 60)},
-        "minimal": {"primary": (44, 62, 80), "secondary": (149, 165, 166)},
-        "executive": {"primary": (44, 62, 80), "secondary": (241, 196, 15)}
-    }
-    
-    template = colors.get(resume.template_style, colors["modern"])
-    
-    # Header
-    pdf.set_font('Helvetica', 'B', 24)
-    pdf.set_text_color(*template["primary"])
-    pdf.cell(0, 20, resume.name, ln=True, align='C')
-    
-    # Title
-    pdf.set_font('Helvetica', 'I', 16)
-    pdf.set_text_color(*template["secondary"])
-    pdf.cell(0, 10, resume.title, ln=True, align='C')
-    
-    # Contact Info
-    pdf.set_font('Helvetica', '', 10)
-    pdf.set_text_color(*template["primary"])
-    contact_info = []
-    if resume.email: contact_info.append(resume.email)
-    if resume.phone: contact_info.append(resume.phone)
-    if resume.location: contact_info.append(resume.location)
-    pdf.cell(0, 10, " | ".join(contact_info), ln=True, align='C')
-    
-    # Online Presence
-    if any([resume.website, resume.linkedin, resume.github]):
-        pdf.ln(5)
-        online_info = []
-        if resume.website: online_info.append(f"Website: {resume.website}")
-        if resume.linkedin: online_info.append(f"LinkedIn: {resume.linkedin}")
-        if resume.github: online_info.append(f"GitHub: {resume.github}")
-        pdf.cell(0, 10, " | ".join(online_info), ln=True, align='C')
-    
-    # Summary
-    if resume.summary:
-        pdf.ln(10)
-        pdf.set_font('Helvetica', 'B', 14)
-        pdf.set_text_color(*template["primary"])
-        pdf.cell(0, 10, "Professional Summary", ln=True)
-        pdf.set_font('Helvetica', '', 11)
-        pdf.set_text_color(0, 0, 0)
-        pdf.multi_cell(0, 6, resume.summary)
-    
-    # Experience
-    if resume.experience:
-        pdf.ln(10)
-        pdf.set_font('Helvetica', 'B', 14)
-        pdf.set_text_color(*template["primary"])
-        pdf.cell(0, 10, "Professional Experience", ln=True)
-        pdf.set_font('Helvetica', '', 11)
-        pdf.set_text_color(0, 0, 0)
-        for line in resume.experience.split('\n'):
-            if line.strip():
-                if line.startswith('•'):
-                    pdf.cell(10)  # Indent bullet points
-                pdf.multi_cell(0, 6, line)
-    
-    # Education
-    if resume.education:
-        pdf.ln(10)
-        pdf.set_font('Helvetica', 'B', 14)
-        pdf.set_text_color(*template["primary"])
-        pdf.cell(0, 10, "Education", ln=True)
-        pdf.set_font('Helvetica', '', 11)
-        pdf.set_text_color(0, 0, 0)
-        for line in resume.education.split('\n'):
-            if line.strip():
-                if line.startswith('•'):
-                    pdf.cell(10)
-                pdf.multi_cell(0, 6, line)
-    
-    # Skills
-    if resume.skills:
-        pdf.ln(10)
-        pdf.set_font('Helvetica', 'B', 14)
-        pdf.set_text_color(*template["primary"])
-        pdf.cell(0, 10, "Skills", ln=True)
-        pdf.set_font('Helvetica', '', 11)
-        pdf.set_text_color(0, 0, 0)
-        skills_list = [s.strip() for s in resume.skills.split(',')]
-        skills_text = " • ".join(skills_list)
-        pdf.multi_cell(0, 6, skills_text)
-    
-    # Languages
-    if resume.languages:
-        pdf.ln(10)
-        pdf.set_font('Helvetica', 'B', 14)
-        pdf.set_text_color(*template["primary"])
-        pdf.cell(0, 10, "Languages", ln=True)
-        pdf.set_font('Helvetica', '', 11)
-        pdf.set_text_color(0, 0, 0)
-        languages_list = [l.strip() for l in resume.languages.split(',')]
-        languages_text = " • ".join(languages_list)
-        pdf.multi_cell(0, 6, languages_text)
-    
-    # Certificates
-    if resume.certificates:
-        pdf.ln(10)
-        pdf.set_font('Helvetica', 'B', 14)
-        pdf.set_text_color(*template["primary"])
-        pdf.cell(0, 10, "Certifications", ln=True)
-        pdf.set_font('Helvetica', '', 11)
-        pdf.set_text_color(0, 0, 0)
-        for line in resume.certificates.split('\n'):
-            if line.strip():
-                if line.startswith('•'):
-                    pdf.cell(10)
-                pdf.multi_cell(0, 6, line)
-    
-    # Save PDF
+@profiling.profiled
+def generate_pdf_resume(resume: ResumeRequest, output_path: str, layout: Optional[dict] = None):
+    """Generate a PDF resume using the shared renderer in pdf_generator"""
+    from pdf_generator import render_resume
+
     try:
-        pdf.output(output_path)
+        render_resume(resume, output_path, layout=layout)
         return True
     except Exception as e:
-        logger.error(f"Error generating PDF: {str(e)}")
+        logger.error("Error generating PDF: %s", e)
         return False
 
+# Lifecycle
+@app.on_event("startup")
+def on_startup():
+    init_db()
+    search_index.init_search_index()
+    if METRICS_DIR:
+        REGISTRY.enable_multiprocess(METRICS_DIR)
+
+@app.on_event("shutdown")
+def on_shutdown():
+    engine.dispose()
+
 # Routes
 @app.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    logger.info(f"Login attempt for user: {form_data.username}")
+    request_logger.info("Login attempt for user: %s", form_data.username)
+    admission.AUTH_RATE.check(admission.client_address(request))
     try:
         # Debug: Check if admin exists
         admin = db.query(Admin).filter(Admin.username == form_data.username).first()
         if not admin:
-            logger.warning(f"Admin not found: {form_data.username}")
+            logger.warning("Admin not found: %s", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -369,9 +357,11 @@ async def login_for_access_token(
             )
             
         # Debug: Check password
-        logger.info(f"Verifying password for admin: {form_data.username}")
-        if not verify_password(form_data.password, admin.hashed_password):
-            logger.warning(f"Invalid password for admin: {form_data.username}")
+        request_logger.info("Verifying password for admin: %s", form_data.username)
+        async with admission.AUTH.slot():
+            password_ok = await run_in_threadpool(verify_password, form_data.password, admin.hashed_password)
+        if not password_ok:
+            logger.warning("Invalid password for admin: %s", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -382,15 +372,15 @@ async def login_for_access_token(
         access_token = create_access_token(
             data={"sub": admin.username}, expires_delta=access_token_expires
         )
-        logger.info(f"Successful login for user: {form_data.username}")
+        logger.info("Successful login for user: %s", form_data.username)
         return {"access_token": access_token, "token_type": "bearer"}
     except Exception as e:
-        logger.error(f"Error during login: {str(e)}")
+        logger.error("Error during login: %s", e)
         raise
 
 @app.post("/admin/create", response_model=Token)
 async def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
-    logger.info(f"Creating new admin user: {admin.username}")
+    logger.info("Creating new admin user: %s", admin.username)
     try:
         # Check if admin already exists
         db_admin = db.query(Admin).filter(
@@ -403,10 +393,12 @@ async def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
             )
             
         # Create new admin
+        async with admission.AUTH.slot():
+            hashed_password = await run_in_threadpool(get_password_hash, admin.password)
         db_admin = Admin(
             username=admin.username,
             email=admin.email,
-            hashed_password=get_password_hash(admin.password)
+            hashed_password=hashed_password
         )
         db.add(db_admin)
         db.commit()
@@ -414,65 +406,119 @@ async def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
         
         # Generate token
         access_token = create_access_token(data={"sub": admin.username})
-        logger.info(f"Successfully created admin user: {admin.username}")
+        logger.info("Successfully created admin user: %s", admin.username)
         return {"access_token": access_token, "token_type": "bearer"}
     except Exception as e:
-        logger.error(f"Error creating admin user: {str(e)}")
+        logger.error("Error creating admin user: %s", e)
         db.rollback()
         raise
 
+# Insert the user or leave an existing one untouched, and get its id back,
+# in one statement. The no-op DO UPDATE makes RETURNING yield the existing row.
+UPSERT_USER = text(
+    "INSERT INTO users (name, email, title, created_at) VALUES (:name, :email, :title, :created_at) "
+    "ON CONFLICT (email) DO UPDATE SET email = excluded.email RETURNING id"
+)
+
+def supports_upsert(db: Session) -> bool:
+    """INSERT ... ON CONFLICT ... RETURNING needs PostgreSQL or SQLite 3.35+"""
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql":
+        return True
+    return dialect.name == "sqlite" and dialect.dbapi.sqlite_version_info >= (3, 35)
+
+def upsert_user(db: Session, request: ResumeRequest) -> int:
+    """Id of the user with `request.email`, created if needed, inside the caller's transaction"""
+    params = {"name": request.name, "email": request.email, "title": request.title,
+              "created_at": datetime.utcnow()}
+    if supports_upsert(db):
+        return db.execute(UPSERT_USER, params).scalar()
+    user_id = db.query(User.id).filter(User.email == request.email).scalar()
+    if user_id is None:
+        user = User(**params)
+        db.add(user)
+        db.flush()
+        user_id = user.id
+    return user_id
+
 @app.post("/generate_resume", response_model=ResumeResponse)
 async def generate_resume(request: ResumeRequest, db: Session = Depends(get_db)):
     """Generate a new resume for a user"""
+    # Turn away clients over their rate before doing any work for them
+    admission.RENDER_RATE.check(request.email)
+    pdf_path = None
     try:
-        # Find or create user
-        user = db.query(User).filter(User.email == request.email).first()
-        if not user:
-            user = User(
-                name=request.name,
-                email=request.email,
-                title=request.title
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            logger.info(f"Created new user: {user.id}")
+        async with admission.RENDER.slot():
+            # Unique per request, so concurrent submits never share a file
+            pdf_filename = f"{request.email.replace('@', '_').replace('.', '_')}_{int(datetime.utcnow().timestamp())}_{uuid.uuid4().hex[:8]}.pdf"
+            pdf_path = os.path.join("static/resumes", pdf_filename)
         
-        # Generate unique filename
-        pdf_filename = f"{user.email.replace('@', '_').replace('.', '_')}_{int(datetime.utcnow().timestamp())}.pdf"
-        pdf_path = os.path.join("static/resumes", pdf_filename)
+            # Split every section once; scoring and rendering share the result
+            with PIPELINE_STAGE.time("parse"):
+                layout = resume_layout(request)
         
-        # Calculate resume score
-        score = calculate_resume_score(request)
+            # Calculate resume score
+            with PIPELINE_STAGE.time("score"):
+                score = calculate_resume_score(request, layout)
         
-        # Create resume entry
-        resume = Resume(
-            user_id=user.id,
-            template_style=request.template_style,
-            score=score,
-            pdf_path=pdf_path,
-            downloaded_count=0
-        )
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
-        logger.info(f"Created resume entry: {resume.id}")
+            # Render first: a failed render leaves nothing behind in the database
+            with PIPELINE_STAGE.time("pdf_render"):
+                rendered = await run_in_threadpool(generate_pdf_resume, request, pdf_path, layout)
+            if not rendered:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to generate PDF resume"
+                )
+            PDF_SIZE.observe(value=os.path.getsize(pdf_path))
         
-        # Generate PDF
-        if not generate_pdf_resume(request, pdf_path):
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to generate PDF resume"
+            # User, resume and search index in one transaction with one commit
+            with PIPELINE_STAGE.time("user_upsert"):
+                user_id = upsert_user(db, request)
+            resume = Resume(
+                user_id=user_id,
+                template_style=request.template_style,
+                score=score,
+                pdf_path=pdf_path,
+                content=resume_store.pack_resume(request),
+                downloaded_count=0,
+                created_at=datetime.utcnow()
             )
+            with PIPELINE_STAGE.time("resume_insert"):
+                db.add(resume)
+                db.flush()
+                # Indexed in the same transaction, so the index never misses a resume
+                search_index.index_resume(db, resume.id, request.dict())
+            # Serialize before commit expires the attributes, saving a reload
+            response = ResumeResponse.from_orm(resume)
+            with PIPELINE_STAGE.time("commit"):
+                db.commit()
+            request_logger.info("Created resume entry: %s for user: %s", response.id, user_id)
+            pdf_path = None
+            return response
         
-        return resume
-        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in generate_resume: {str(e)}")
+        logger.error("Error in generate_resume: %s", e)
+        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
+    finally:
+        # Set only when the request failed after rendering
+        if pdf_path and os.path.exists(pdf_path):
+            os.remove(pdf_path)
+
+@app.post("/preview_resume")
+async def preview_resume(request: ResumeRequest, format: str = "html"):
+    """Preview a resume as HTML or layout JSON without rendering a PDF"""
+    if format not in preview.PREVIEW_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(preview.PREVIEW_FORMATS)}")
+    rendered = preview.preview_cache.render(request, format)
+    if format == "html":
+        return HTMLResponse(rendered)
+    return rendered
 
 @app.get("/admin/stats", dependencies=[Depends(get_current_admin)])
 async def get_admin_stats(db: Session = Depends(get_db)):
@@ -489,9 +535,51 @@ async def get_admin_stats(db: Session = Depends(get_db)):
             "total_downloads": total_downloads
         }
     except Exception as e:
-        logger.error(f"Error fetching admin stats: {str(e)}")
+        logger.error("Error fetching admin stats: %s", e)
         raise
 
+def build_dashboard(db: Session, limit: int) -> dict:
+    """Stats plus the most recent users and resumes, read in one session"""
+    # One round trip for all three aggregates instead of three separate queries
+    total_users, total_resumes, total_downloads = db.query(
+        db.query(func.count(User.id)).scalar_subquery(),
+        db.query(func.count(Resume.id)).scalar_subquery(),
+        db.query(func.coalesce(func.sum(Resume.downloaded_count), 0)).scalar_subquery(),
+    ).one()
+    users = db.query(User).order_by(User.id.desc()).limit(limit).all()
+    resumes = db.query(Resume).order_by(Resume.id.desc()).limit(limit).all()
+    return {
+        "stats": {
+            "total_users": total_users,
+            "total_resumes": total_resumes,
+            "total_downloads": total_downloads
+        },
+        "users": [UserResponse.from_orm(u) for u in users],
+        "resumes": [ResumeResponse.from_orm(r) for r in resumes],
+    }
+
+@app.get("/admin/dashboard", dependencies=[Depends(get_current_admin)])
+async def get_admin_dashboard(request: Request, limit: int = 100, db: Session = Depends(get_db)):
+    """Everything the admin panel shows, cached briefly and revalidated with ETags"""
+    limit = max(1, min(limit, 1000))
+    cached = _dashboard_cache.get(limit)
+    if cached and cached[0] > time.monotonic():
+        _, etag, body = cached
+    else:
+        logger.info("Building admin dashboard")
+        try:
+            body = json.dumps(jsonable_encoder(build_dashboard(db, limit))).encode()
+        except Exception as e:
+            logger.error("Error building admin dashboard: %s", e)
+            raise
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        _dashboard_cache[limit] = (time.monotonic() + DASHBOARD_CACHE_TTL, etag, body)
+
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(DASHBOARD_CACHE_TTL)}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.get("/admin/users", response_model=List[UserResponse], dependencies=[Depends(get_current_admin)])
 async def get_all_users(
     skip: int = 0,
@@ -504,7 +592,7 @@ async def get_all_users(
         logger.info("Users fetched successfully")
         return users
     except Exception as e:
-        logger.error(f"Error fetching users: {str(e)}")
+        logger.error("Error fetching users: %s", e)
         raise
 
 @app.get("/admin/resumes", response_model=List[ResumeResponse], dependencies=[Depends(get_current_admin)])
@@ -519,41 +607,139 @@ async def get_all_resumes(
         logger.info("Resumes fetched successfully")
         return resumes
     except Exception as e:
-        logger.error(f"Error fetching resumes: {str(e)}")
+        logger.error("Error fetching resumes: %s", e)
         raise
 
+@app.post("/admin/export/{table}/link")
+async def export_link(table: str, format: str = "csv", gzip: bool = False, admin: Admin = Depends(get_current_admin)):
+    """A short-lived URL a browser can download the export from without the bearer token"""
+    if table not in export.EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
+    link = create_access_token(
+        data={"sub": admin.username, "scope": f"export:{table}"},
+        expires_delta=timedelta(minutes=EXPORT_LINK_EXPIRE_MINUTES)
+    )
+    query = urlencode({"format": format, "gzip": str(gzip).lower(), "link": link})
+    return {"url": f"/admin/export/{table}?{query}", "expires_in": EXPORT_LINK_EXPIRE_MINUTES * 60}
+
+@app.get("/admin/export/{table}", dependencies=[Depends(get_export_admin)])
+async def export_table(table: str, format: str = "csv", gzip: bool = False):
+    """Stream every row of users or resumes as CSV, NDJSON or Parquet"""
+    if table not in export.EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
+    if format not in export.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(export.EXPORT_FORMATS)}")
+    if format == "parquet" and not export.parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow to be installed")
+
+    logger.info("Exporting %s as %s%s", table, format, " (gzip)" if gzip else "")
+    media_type, extension = export.EXPORT_FORMATS[format]
+    filename = f"{table}_{datetime.utcnow():%Y%m%d_%H%M%S}.{extension}"
+    if gzip:
+        media_type, filename = "application/gzip", f"{filename}.gz"
+    # A sync generator is iterated in the threadpool, keeping DB reads off the event loop
+    return StreamingResponse(
+        export.export_chunks(table, format, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/admin/search", dependencies=[Depends(get_current_admin)])
+async def search_resumes(
+    q: str,
+    field: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """Full-text search over resume summary, experience, education, skills and certificates"""
+    if not search_index.available():
+        raise HTTPException(status_code=501, detail="Full-text search requires SQLite FTS5")
+    if field is not None and field not in search_index.INDEXED_FIELDS:
+        raise HTTPException(status_code=400, detail=f"field must be one of {', '.join(search_index.INDEXED_FIELDS)}")
+    logger.info("Searching resumes: %s", q)
+    try:
+        return search_index.search(db, q, limit=max(1, min(limit, 100)), offset=max(0, offset), field=field)
+    except Exception as e:
+        logger.error("Error searching resumes: %s", e)
+        raise
+
+@app.post("/admin/search/reindex", dependencies=[Depends(get_current_admin)])
+async def reindex_resumes(db: Session = Depends(get_db)):
+    """Rebuild the search index from stored resume content"""
+    # Reads and re-indexes every resume; keep it off the event loop
+    return {"indexed": await run_in_threadpool(search_index.rebuild_index, db)}
+
 @app.get("/user/resumes", response_model=list[ResumeResponse])
 async def get_user_resumes(email: str, db: Session = Depends(get_db)):
     """Get all resumes for a specific user by email"""
-    logger.info(f"Fetching resumes for user: {email}")
+    request_logger.info("Fetching resumes for user: %s", email)
     try:
         # Get user
         user = db.query(User).filter(User.email == email).first()
         if not user:
-            logger.warning(f"User not found: {email}")
+            request_logger.info("User not found: %s", email)
             return []
             
         # Get resumes
         resumes = db.query(Resume).filter(Resume.user_id == user.id).order_by(Resume.created_at.desc()).all()
-        logger.info(f"Found {len(resumes)} resumes for user: {email}")
+        request_logger.info("Found %d resumes for user: %s", len(resumes), email)
         return resumes
         
     except Exception as e:
-        logger.error(f"Error fetching user resumes: {str(e)}")
+        logger.error("Error fetching user resumes: %s", e)
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
 
+# One lock per PDF being re-rendered; entries go away once no thread holds them
+_render_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_render_locks_guard = threading.Lock()
+
+@profiling.profiled
+def ensure_resume_pdf(resume: Resume) -> bool:
+    """Make sure the cached PDF exists, re-rendering it from stored content if it was evicted"""
+    if resume.pdf_path and os.path.exists(resume.pdf_path):
+        return True
+    if not resume.content:
+        return False
+    with _render_locks_guard:
+        lock = _render_locks.setdefault(resume.pdf_path, threading.Lock())
+    # Concurrent downloads of the same resume wait for one render instead of repeating it
+    with lock:
+        if os.path.exists(resume.pdf_path):
+            return True
+        logger.info("Re-rendering evicted PDF for resume: %s", resume.id)
+        request = ResumeRequest(**resume_store.unpack_resume(resume.content))
+        # Render beside the target and rename it into place, so a download
+        # (also from another worker) never serves a half-written file
+        tmp_path = f"{resume.pdf_path}.{uuid.uuid4().hex[:8]}.tmp"
+        if not generate_pdf_resume(request, tmp_path):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, resume.pdf_path)
+        return True
+
 @app.get("/download_resume/{resume_id}")
 async def download_resume(resume_id: int, db: Session = Depends(get_db)):
     """Download a specific resume by ID"""
-    logger.info(f"Downloading resume: {resume_id}")
+    request_logger.info("Downloading resume: %s", resume_id)
     try:
         resume = db.query(Resume).filter(Resume.id == resume_id).first()
         if not resume:
             raise HTTPException(status_code=404, detail="Resume not found")
         
+        if resume.pdf_path and os.path.exists(resume.pdf_path):
+            available = True
+        else:
+            # Evicted; re-rendering costs as much as a new resume
+            async with admission.RENDER.slot():
+                available = await run_in_threadpool(ensure_resume_pdf, resume)
+        if not available:
+            raise HTTPException(status_code=404, detail="Resume PDF is no longer available")
+        
         # Increment download count
         resume.downloaded_count += 1
         db.commit()
@@ -565,17 +751,88 @@ async def download_resume(resume_id: int, db: Session = Depends(get_db)):
             filename=f"resume_{resume_id}.pdf"
         )
     except Exception as e:
-        logger.error(f"Error downloading resume: {str(e)}")
+        logger.error("Error downloading resume: %s", e)
         raise
 
+@app.post("/admin/pdf_cache/evict", dependencies=[Depends(get_current_admin)])
+async def evict_pdf_cache(older_than_days: int = 30, db: Session = Depends(get_db)):
+    """Delete cached PDFs that can be rebuilt from stored content"""
+    # Walks every old resume and deletes files; keep it off the event loop
+    return await run_in_threadpool(resume_store.evict_pdfs, db, older_than_days)
+
+@app.get("/admin/profiles", dependencies=[Depends(get_current_admin)])
+async def get_profiles():
+    """List stored request profiles, newest first"""
+    return profiling.list_profiles()
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(get_current_admin)])
+async def get_profile(profile_id: str, format: str = "pstats", sort: str = "cumulative"):
+    """Download a stored profile as a pstats file, or as a text report with format=text"""
+    path = profiling.profile_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        if sort not in ("cumulative", "tottime", "calls"):
+            raise HTTPException(status_code=400, detail="sort must be cumulative, tottime or calls")
+        return PlainTextResponse(profiling.profile_summary(path, sort=sort))
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness check; touches neither the database nor the filesystem"""
+    return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    logger.info("Starting FastAPI server...")
-    uvicorn.run(
-        "app:app",
-        host="127.0.0.1",
-        port=8090,
-        reload=True,
-        log_level="debug",
-        access_log=True
+    parser = argparse.ArgumentParser(description="Run the Resume Builder API")
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8090")))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")),
+        help="worker processes for production mode; 0 (default) runs the auto-reloading development server"
     )
+    args = parser.parse_args()
+
+    if args.workers:
+        # Create the schema once, before the workers start, so they only find it
+        init_db()
+        search_index.init_search_index()
+        engine.dispose()
+        # Workers share their metrics through files here, so any of them can answer a scrape
+        metrics_dir, created = prepare_multiprocess_dir()
+        # Rate limit buckets are shared the same way; admission control also
+        # sizes each worker's render and auth slots by the number of workers
+        os.environ.setdefault("RATE_LIMIT_DB", os.path.join(metrics_dir, "rate_limits.db"))
+        os.environ["WEB_CONCURRENCY"] = str(args.workers)
+        logger.info("Starting FastAPI server with %d workers...", args.workers)
+        try:
+            uvicorn.run(
+                "app:app",
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                log_level="info",
+                log_config=None,  # keep the queued handlers from log_config
+                access_log=False,
+                proxy_headers=True
+            )
+        finally:
+            if created:
+                shutil.rmtree(metrics_dir, ignore_errors=True)
+    else:
+        logger.info("Starting FastAPI server...")
+        uvicorn.run(
+            "app:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="debug",
+            log_config=None,
+            access_log=True
+        )
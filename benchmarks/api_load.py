@@ -0,0 +1,273 @@
+"""End-to-end load test for the Resume Builder API.
+
+Starts the FastAPI app under uvicorn against a temporary SQLite database
+seeded with synthetic users and resumes, drives the main endpoints with
+concurrent async clients and reports throughput and latency percentiles
+per endpoint.
+
+    python -m benchmarks.api_load --users 10000 --resumes 50000 --save baseline.json
+    python -m benchmarks.api_load --users 10000 --resumes 50000 --baseline baseline.json
+
+With --baseline the run exits non-zero when any endpoint regresses by more
+than --threshold (throughput down or p50/p95 latency up).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADMIN_USERNAME = "bench-admin"
+ADMIN_PASSWORD = "bench-password"
+TEMPLATES = ["modern", "professional", "creative", "minimal", "executive"]
+SEED_CHUNK = 10000
+
+ENDPOINTS = ["generate_resume", "user_resumes", "download_resume",
+             "admin_stats", "admin_users", "admin_resumes", "admin_dashboard", "token"]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _synthetic_resume(i, email=None):
+    return {
+        "name": f"User {i}",
+        "email": email or f"user{i}@example.com",
+        "title": "Software Engineer",
+        "phone": "+1 555 0100",
+        "location": "Remote",
+        "summary": "Engineer focused on reliable backend systems and clear documentation. " * 3,
+        "experience": "Acme Corp - Engineer\n01/2020 - 12/2023\n- Built APIs\n- Ran on-call",
+        "education": "BSc Computer Science - State University\n2014 - 2018",
+        "skills": "Python",
+        "languages": "English",
+        "certificates": "",
+        "template_style": random.choice(TEMPLATES),
+    }
+
+
+def seed_database(workdir, users, resumes):
+    """Create and fill the temporary database; every seeded resume shares one sample PDF"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    sys.path.insert(0, REPO_ROOT)
+    from passlib.context import CryptContext
+    from database import Admin, Resume, User, engine, init_db
+    from pdf_generator import render_resume
+    from types import SimpleNamespace
+
+    init_db()
+    sample_pdf = os.path.join(workdir, "static", "resumes", "sample.pdf")
+    render_resume(SimpleNamespace(website="", linkedin="", github="", **_synthetic_resume(0)), sample_pdf)
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(Admin.__table__.insert(), [{
+            "username": ADMIN_USERNAME, "email": "bench-admin@example.com",
+            "hashed_password": CryptContext(schemes=["bcrypt"]).hash(ADMIN_PASSWORD),
+            "is_active": True, "created_at": now,
+        }])
+        for start in range(0, users, SEED_CHUNK):
+            conn.execute(User.__table__.insert(), [
+                {"name": f"User {i}", "email": f"user{i}@example.com", "title": "Software Engineer",
+                 "created_at": now}
+                for i in range(start + 1, min(start + SEED_CHUNK, users) + 1)
+            ])
+        for start in range(0, resumes, SEED_CHUNK):
+            conn.execute(Resume.__table__.insert(), [
+                {"user_id": random.randint(1, users), "template_style": random.choice(TEMPLATES),
+                 "score": random.randint(20, 100), "pdf_path": sample_pdf, "downloaded_count": 0,
+                 "created_at": now}
+                for _ in range(start, min(start + SEED_CHUNK, resumes))
+            ])
+    engine.dispose()
+
+
+def start_server(workdir, port, extra_args=()):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    # Every request comes from one address, so per-client rate limits would
+    # measure the limiter; concurrency limits stay on unless overridden
+    env.setdefault("RENDER_RATE_PER_MINUTE", "0")
+    env.setdefault("AUTH_RATE_PER_MINUTE", "0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", *extra_args],
+        cwd=workdir, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/healthz", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("Server did not become ready within 60s")
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _build_request(endpoint, args, token, counter):
+    if endpoint == "generate_resume":
+        i = next(counter)
+        return "POST", "/generate_resume", {"json": _synthetic_resume(i, f"bench{i}@example.com")}
+    if endpoint == "user_resumes":
+        return "GET", "/user/resumes", {"params": {"email": f"user{random.randint(1, args.users)}@example.com"}}
+    if endpoint == "download_resume":
+        return "GET", f"/download_resume/{random.randint(1, args.resumes)}", {}
+    if endpoint == "token":
+        return "POST", "/token", {"data": {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}}
+    path = "/admin/" + endpoint.split("_", 1)[1]
+    return "GET", path, {"headers": {"Authorization": f"Bearer {token}"}}
+
+
+async def run_endpoint(client, endpoint, args, token, counter):
+    latencies, errors = [], 0
+    remaining = iter(range(args.requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, path, kwargs = _build_request(endpoint, args, token, counter)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+
+
+async def run_load(base_url, args):
+    counter = itertools.count(1)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        response = await client.post("/token", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+        response.raise_for_status()
+        token = response.json()["access_token"]
+        results = {}
+        for endpoint in args.endpoints:
+            results[endpoint] = await run_endpoint(client, endpoint, args, token, counter)
+            print_row(endpoint, results[endpoint])
+        return results
+
+
+def print_header():
+    print(f"{'endpoint':<18} {'reqs':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+
+
+def print_row(endpoint, r):
+    print(f"{endpoint:<18} {r['requests']:>6} {r['errors']:>6} {r['throughput']:>9.1f} "
+          f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+
+
+def compare(results, baseline, threshold):
+    """Return a list of human readable regressions against a saved baseline"""
+    regressions = []
+    for endpoint, current in results.items():
+        previous = baseline.get("results", {}).get(endpoint)
+        if not previous:
+            continue
+        if current["throughput"] < previous["throughput"] * (1 - threshold):
+            regressions.append(f"{endpoint}: throughput {previous['throughput']:.1f} -> {current['throughput']:.1f} req/s")
+        for key in ("p50_ms", "p95_ms"):
+            if current[key] > previous[key] * (1 + threshold):
+                regressions.append(f"{endpoint}: {key} {previous[key]:.2f} -> {current[key]:.2f}")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{endpoint}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000, help="synthetic users to seed")
+    parser.add_argument("--resumes", type=int, default=20000, help="synthetic resumes to seed")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS, choices=ENDPOINTS)
+    parser.add_argument("--server-arg", action="append", default=[], help="extra argument passed to uvicorn")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary working directory")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.makedirs(os.path.join(workdir, "static", "resumes"))
+    proc = None
+    try:
+        start = time.perf_counter()
+        seed_database(workdir, args.users, args.resumes)
+        print(f"Seeded {args.users} users and {args.resumes} resumes in {time.perf_counter() - start:.1f}s")
+
+        proc, base_url = start_server(workdir, _free_port(), args.server_arg)
+        print_header()
+        results = asyncio.run(run_load(base_url, args))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if args.keep:
+            print(f"Working directory kept at {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"config": {k: v for k, v in vars(args).items() if k not in ("save", "baseline")},
+              "results": results}
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("REGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
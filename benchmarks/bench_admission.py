@@ -0,0 +1,103 @@
+"""Show how admission control bounds latency under overload.
+
+Starts the API twice against one seeded temporary database: once with the
+admission limits effectively off, and once with the configured limits.
+Both runs send /generate_resume (or /token) at a concurrency well above
+what the server can render. The report shows the status codes returned
+and the latency of admitted and rejected requests.
+
+    python -m benchmarks.bench_admission --concurrency 64 --render-concurrency 2 --queue-size 8
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.api_load import (
+    ADMIN_PASSWORD, ADMIN_USERNAME, _free_port, _percentile, _synthetic_resume, seed_database, start_server,
+)
+
+
+async def overload(base_url, endpoint, requests, concurrency):
+    counter = itertools.count(1)
+    remaining = iter(range(requests))
+    by_status = collections.defaultdict(list)
+    retry_after = collections.Counter()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            for _ in remaining:
+                if endpoint == "token":
+                    kwargs = {"data": {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}}
+                else:
+                    i = next(counter)
+                    kwargs = {"json": _synthetic_resume(i, f"overload{i}@example.com")}
+                start = time.perf_counter()
+                try:
+                    response = await client.post(f"/{endpoint}", **kwargs)
+                    status = response.status_code
+                    if "retry-after" in response.headers:
+                        retry_after[response.headers["retry-after"]] += 1
+                except httpx.HTTPError:
+                    status = "timeout"
+                by_status[status].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return by_status, retry_after, elapsed
+
+
+def report(label, by_status, retry_after, elapsed):
+    print(f"\n{label}: {sum(map(len, by_status.values()))} requests in {elapsed:.1f}s")
+    print(f"{'status':<8} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for status, latencies in sorted(by_status.items(), key=lambda item: str(item[0])):
+        latencies.sort()
+        print(f"{status!s:<8} {len(latencies):>6} {_percentile(latencies, 50) * 1000:>9.1f} "
+              f"{_percentile(latencies, 95) * 1000:>9.1f} {latencies[-1] * 1000:>9.1f}")
+    if retry_after:
+        print("Retry-After: " + ", ".join(f"{k}s x{v}" for k, v in sorted(retry_after.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoint", choices=["generate_resume", "token"], default="generate_resume")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--render-concurrency", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--queue-timeout", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.makedirs(os.path.join(workdir, "static", "resumes"))
+    unlimited = {"CONCURRENCY": "100000", "QUEUE_SIZE": "100000", "QUEUE_TIMEOUT": "3600"}
+    limited = {"CONCURRENCY": str(args.render_concurrency), "QUEUE_SIZE": str(args.queue_size),
+               "QUEUE_TIMEOUT": str(args.queue_timeout)}
+    try:
+        seed_database(workdir, users=100, resumes=100)
+        for label, settings in (("without admission control", unlimited), ("with admission control", limited)):
+            for prefix in ("RENDER", "AUTH"):
+                for key, value in settings.items():
+                    os.environ[f"{prefix}_{key}"] = value
+            proc, base_url = start_server(workdir, _free_port())
+            try:
+                report(label, *asyncio.run(overload(base_url, args.endpoint, args.requests, args.concurrency)))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
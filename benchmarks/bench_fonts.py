@@ -0,0 +1,74 @@
+"""Measure render cost and PDF size with core and embedded TrueType fonts.
+
+Renders the same resume in latin-1 and in non-latin text (Polish names,
+Greek, Cyrillic) under each font mode. The embedded-font case is also
+timed with the per-process parsed-font cache cleared before every
+render, which is what re-parsing the TTF per document would cost.
+
+    python -m benchmarks.bench_fonts --renders 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import pdf_generator
+from benchmarks.api_load import _synthetic_resume
+
+LATIN = {"name": "Lukasz Zolc", "location": "Krakow, Poland",
+         "skills": "Python, SQL, Docker, Kubernetes", "languages": "Polish, English, German"}
+UNICODE = {"name": "Łukasz Żółć", "location": "Kraków, Polska",
+           "skills": "Python, SQL, Docker, Kubernetes", "languages": "Polski, Ελληνικά, Русский"}
+
+
+def _resume(overrides):
+    resume = _synthetic_resume(0)
+    resume.update(website="", linkedin="", github="", **overrides)
+    resume["experience"] += "\n• Led a team of five\n• Cut render latency by 40%"
+    return SimpleNamespace(**resume)
+
+
+def _measure(resume, path, renders, clear_font_cache=False):
+    timings = []
+    for _ in range(renders):
+        if clear_font_cache:
+            pdf_generator._font_cache.clear()
+        start = time.perf_counter()
+        pdf_generator.render_resume(resume, path)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=50)
+    args = parser.parse_args()
+
+    fonts = pdf_generator.find_fonts()
+    if not fonts:
+        print("No TrueType font found; set RESUME_FONT_PATH")
+        return 1
+    print("fonts: " + ", ".join(f"{style or 'regular'}={path}" for style, path in fonts.items()))
+
+    cases = [
+        ("latin-1, auto (core font)", LATIN, "auto", False),
+        ("latin-1, always embed", LATIN, "always", False),
+        ("unicode, auto (embedded)", UNICODE, "auto", False),
+        ("unicode, font re-parsed", UNICODE, "auto", True),
+        ("unicode, never embed", UNICODE, "never", False),
+    ]
+    print(f"{'case':<28} {'ms/render':>10} {'bytes':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "r.pdf")
+        for label, text, mode, clear in cases:
+            pdf_generator.EMBED_FONTS = mode
+            ms, size = _measure(_resume(text), path, args.renders, clear)
+            print(f"{label:<28} {ms:>10.2f} {size:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
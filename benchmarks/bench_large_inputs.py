@@ -0,0 +1,147 @@
+"""Measure the cost of large resume submissions: shared section parsing and body limits.
+
+1. Parsing: for resumes whose long sections hold --sizes characters each,
+   times scoring plus layout the old way (the scorer splitting every
+   section itself, then the renderer splitting it again) against one
+   shared `resume_layout` used by both. Scores must match, and full PDF
+   renders are timed as well for scale.
+2. Body limits: starts the API with the default MAX_BODY_BYTES and again
+   with the limit disabled (MAX_BODY_BYTES=0), posts --oversize MB bodies
+   to /generate_resume, and reports status codes, time to answer and the
+   server's peak RSS. Without the streaming limit the whole body is read
+   and parsed before the per-field limits reject it.
+
+    python -m benchmarks.bench_large_inputs --sizes 1000,8000,32000 --oversize 20 --requests 5
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.api_load import _free_port, _synthetic_resume, start_server
+
+
+def _large_resume(chars):
+    resume = _synthetic_resume(0)
+    line = "Led a platform team shipping APIs used by millions of customers"
+    lines = "\n".join([line] * max(1, chars // (len(line) + 1)))
+    resume.update(
+        website="", linkedin="", github="",
+        summary=("Engineer focused on reliable backend systems. " * (chars // 46 + 1))[:chars],
+        experience=lines, education=lines, certificates=lines,
+        skills=", ".join(["Python"] * max(1, chars // 8)),
+    )
+    return resume
+
+
+def old_score(resume):
+    """The scorer before it shared the layout; splits every section itself"""
+    score = 0
+    if resume.name: score += 5
+    if resume.email: score += 5
+    if resume.phone: score += 5
+    if resume.location: score += 5
+    if resume.title: score += 5
+    if any([resume.website, resume.linkedin, resume.github]): score += 5
+    if resume.summary and len(resume.summary.split()) >= 30:
+        score += 10
+    elif resume.summary:
+        score += 5
+    if resume.experience:
+        score += min(len(resume.experience.strip().split('\n')) * 5, 25)
+    if resume.education:
+        score += min(len(resume.education.strip().split('\n')) * 5, 15)
+    if resume.skills:
+        score += min(len([s.strip() for s in resume.skills.split(',')]), 10)
+    if resume.languages:
+        score += min(len(resume.languages.split(',')) * 2, 5)
+    if resume.certificates:
+        score += min(len(resume.certificates.strip().split('\n')) * 2, 5)
+    return min(score, 100)
+
+
+def _time(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def compare_parsing(sizes, repeat):
+    import app
+    from pdf_generator import render_resume
+    from resume_layout import resume_layout
+
+    print(f"{'chars/section':>13} {'old ms':>8} {'shared ms':>10} {'render ms':>10} {'score':>6}")
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "r.pdf")
+        for chars in sizes:
+            request = app.ResumeRequest(**_large_resume(chars))
+            old_ms, old = _time(lambda: (old_score(request), resume_layout(request))[0], repeat)
+            new_ms, new = _time(lambda: app.calculate_resume_score(request, resume_layout(request)), repeat)
+            layout = resume_layout(request)
+            render_ms, _ = _time(lambda: render_resume(request, path, layout=layout), 1)
+            ok &= old == new
+            print(f"{chars:>13} {old_ms:>8.2f} {new_ms:>10.2f} {render_ms:>10.0f} "
+                  f"{new:>6}{'' if old == new else f' != {old}'}")
+    return ok
+
+
+def _peak_rss_mb(proc):
+    proc.terminate()
+    _, _, usage = os.wait4(proc.pid, 0)
+    proc.returncode = 0
+    return usage.ru_maxrss / 1024
+
+
+def oversize_requests(workdir, megabytes, requests):
+    resume = _synthetic_resume(0)
+    resume["experience"] = "x" * (megabytes * 1024 * 1024)
+    body = httpx.Request("POST", "/", json=resume).content
+
+    print(f"\n{'MAX_BODY_BYTES':<15} {'statuses':<10} {'ms/request':>11} {'peak RSS MB':>12}")
+    for label, limit in (("default", None), ("0 (off)", "0")):
+        if limit is not None:
+            os.environ["MAX_BODY_BYTES"] = limit
+        try:
+            proc, base_url = start_server(workdir, _free_port())
+        finally:
+            os.environ.pop("MAX_BODY_BYTES", None)
+        statuses = set()
+        start = time.perf_counter()
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            for _ in range(requests):
+                statuses.add(client.post("/generate_resume", content=body,
+                                         headers={"content-type": "application/json"}).status_code)
+        elapsed = (time.perf_counter() - start) / requests * 1000
+        rss = _peak_rss_mb(proc)
+        print(f"{label:<15} {','.join(map(str, sorted(statuses))):<10} {elapsed:>11.1f} {rss:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,8000,32000", help="characters per long section")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--oversize", type=int, default=20, help="MB in each oversized request")
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.makedirs(os.path.join(workdir, "static", "resumes"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    try:
+        ok = compare_parsing([int(size) for size in args.sizes.split(",")], args.repeat)
+        oversize_requests(workdir, args.oversize, args.requests)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
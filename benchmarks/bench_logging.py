@@ -0,0 +1,105 @@
+"""Measure what a log call costs the request thread, before and after the queued pipeline.
+
+Logs --records INFO records with a few arguments through:
+
+- sync:    a StreamHandler formatting f-strings in the calling thread,
+           the way app.py logged before
+- queued:  log_config's QueueHandler, with formatting and JSON encoding
+           left to the listener thread
+- sampled: the same, with the logger sampled at --sample-rate
+
+Output goes to a temporary file; --sink-latency-us adds a delay to every
+write, like a blocked stderr pipe or a slow log shipper. The time spent in
+the calling thread is reported, then how long until every record was
+written. On a single CPU the listener competes with the caller, so the
+queued pipeline only pays off once writes are slow.
+
+    python -m benchmarks.bench_logging --records 100000 --sample-rate 0.1 --sink-latency-us 50
+"""
+import argparse
+import logging
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import QueueListener
+
+import log_config
+
+
+class SlowStream:
+    def __init__(self, stream, latency):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def run_sync(stream, records):
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    logger = _logger("sync", handler)
+    start = time.perf_counter()
+    for i in range(records):
+        logger.info(f"Fetching resumes for user: user{i}@example.com ({i % 7} found)")
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def run_queued(stream, records, sample_rate=1.0):
+    output = logging.StreamHandler(stream)
+    output.setFormatter(log_config.JsonFormatter())
+    handler = log_config.NonBlockingQueueHandler(queue.Queue(maxsize=records))
+    handler.addFilter(log_config.RequestIdFilter())
+    handler.addFilter(log_config.SamplingFilter({"bench": sample_rate}))
+    listener = QueueListener(handler.queue, output)
+    logger = _logger(f"queued{sample_rate}", handler)
+
+    token = log_config.request_id_var.set("bench")
+    listener.start()
+    start = time.perf_counter()
+    for i in range(records):
+        logger.info("Fetching resumes for user: %s (%d found)", f"user{i}@example.com", i % 7)
+    caller = time.perf_counter() - start
+    listener.stop()
+    drained = time.perf_counter() - start
+    log_config.request_id_var.reset(token)
+    return caller, drained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--sink-latency-us", type=float, default=0, help="delay added to every write")
+    args = parser.parse_args()
+
+    cases = (("sync", run_sync, {}),
+             ("queued", run_queued, {}),
+             (f"sampled {args.sample_rate:g}", run_queued, {"sample_rate": args.sample_rate}))
+    print(f"{'pipeline':<14} {'us/call':>8} {'drained s':>10} {'written':>8}")
+    for label, run, kwargs in cases:
+        with tempfile.TemporaryFile("w+") as stream:
+            caller, drained = run(SlowStream(stream, args.sink_latency_us / 1e6), args.records, **kwargs)
+            stream.seek(0)
+            written = sum(1 for _ in stream)
+        print(f"{label:<14} {caller / args.records * 1e6:>8.2f} {drained:>10.2f} {written:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Benchmark the shared PDF renderer on 1, 5 and 20 page documents.
+
+Both render paths are measured: free-form text (the AI text path) and a
+structured resume (the form path). Peak memory is traced Python allocations.
+
+    python -m benchmarks.bench_pdf_render --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from pdf_generator import render_resume, render_text
+
+# Roughly one rendered line each at 11pt on A4; ~40 body lines fit on a page
+LINE = "Designed and shipped a service that processes customer events with low latency"
+LINES_PER_PAGE = 40
+
+
+def _text(pages):
+    return "\n".join(f"{i:05d} {LINE}" for i in range(pages * LINES_PER_PAGE))
+
+
+def _resume(pages):
+    body = _text(pages).split("\n")
+    return SimpleNamespace(
+        name="Jane Doe", title="Senior Backend Engineer", email="jane@example.com",
+        phone="+49 30 1234567", location="Berlin", website="", linkedin="", github="",
+        template_style="modern", summary=LINE,
+        experience="\n".join(body[: len(body) // 2]),
+        education="\n".join(body[len(body) // 2:]),
+        skills="Python", languages="English", certificates="",
+    )
+
+
+def _measure(render, payload, output_path, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = render(payload, output_path)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    render(payload, output_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pages, min(timings), peak, os.path.getsize(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "bench.pdf")
+        print(f"{'path':<8} {'target':>6} {'pages':>6} {'ms':>9} {'ms/page':>8} {'peak KiB':>9} {'size KiB':>9}")
+        for target in args.pages:
+            for label, render, payload in (("text", render_text, _text(target)),
+                                           ("resume", render_resume, _resume(target))):
+                pages, best, peak, size = _measure(render, payload, output_path, args.repeat)
+                print(f"{label:<8} {target:>6} {pages:>6} {best * 1000:>9.1f} {best * 1000 / pages:>8.1f} "
+                      f"{peak / 1024:>9.0f} {size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
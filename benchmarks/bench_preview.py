@@ -0,0 +1,104 @@
+"""Compare preview and PDF render cost, and check they lay out the same sections.
+
+For --samples synthetic resumes with random sections left empty, renders
+the PDF and the HTML preview. It reads the section headings back out of
+both, in order: from the PDF's content streams and from the preview's
+<h2> tags. Any difference is reported and the exit status is 1. Then it
+times PDF renders against cold and cached previews.
+
+    python -m benchmarks.bench_preview --samples 200
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import zlib
+from types import SimpleNamespace
+
+from benchmarks.api_load import TEMPLATES, _synthetic_resume
+from pdf_generator import render_resume
+from preview import PreviewCache
+from resume_layout import RESUME_SECTIONS
+
+HEADINGS = {heading for _, heading, _ in RESUME_SECTIONS}
+STREAM = re.compile(rb"/Length (\d+)>>\s*stream\r?\n")
+TEXT = re.compile(rb"\((.*?)\) Tj")
+
+
+class _Resume(SimpleNamespace):
+    def dict(self):
+        return dict(vars(self))
+
+
+def _sample(i):
+    resume = _synthetic_resume(i)
+    resume.update(website="", linkedin="", github="", template_style=random.choice(TEMPLATES),
+                  certificates="AWS Certified - Amazon\n2021")
+    for field, _, _ in RESUME_SECTIONS:
+        if random.random() < 0.3:
+            resume[field] = ""
+    return _Resume(**resume)
+
+
+def pdf_headings(path):
+    data = open(path, "rb").read()
+    texts = []
+    for match in STREAM.finditer(data):
+        # Slice by /Length; compressed data may itself end in what looks like a line break
+        stream = data[match.end():match.end() + int(match.group(1))]
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        texts.extend(t.decode("latin-1") for t in TEXT.findall(stream))
+    return [t for t in texts if t in HEADINGS]
+
+
+def preview_headings(html):
+    return re.findall(r"<h2>(.*?)</h2>", html)
+
+
+def _time(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    random.seed(0)
+    resumes = [_sample(i) for i in range(args.samples)]
+
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "r.pdf")
+        for resume in resumes:
+            render_resume(resume, path)
+            expected, actual = pdf_headings(path), preview_headings(PreviewCache().render(resume))
+            if expected != actual:
+                mismatches += 1
+                print(f"section order differs for {resume.name}: pdf {expected} != preview {actual}")
+        print(f"section order: {args.samples - mismatches}/{args.samples} resumes match")
+
+        pdf_ms = _time(lambda r: render_resume(r, path), resumes)
+    cold_ms = _time(lambda r: PreviewCache().render(r), resumes)
+    json_ms = _time(lambda r: PreviewCache().render(r, "json"), resumes)
+    cache = PreviewCache()
+    for resume in resumes:
+        cache.render(resume)
+    cached_ms = _time(cache.render, resumes)
+
+    print(f"{'renderer':<16} {'ms/resume':>10} {'vs pdf':>8}")
+    for label, ms in (("pdf", pdf_ms), ("html preview", cold_ms), ("json layout", json_ms), ("cached preview", cached_ms)):
+        print(f"{label:<16} {ms:>10.3f} {pdf_ms / ms:>7.0f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Benchmark LinkedIn profile parsing over the saved HTML fixtures.
+
+    python -m benchmarks.bench_profile_parse --iterations 500
+    python -m benchmarks.bench_profile_parse --fixtures path/to/saved/html
+"""
+import argparse
+import glob
+import os
+import time
+
+from profile_parser import ProfileCache, parse_profile_html
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "fixtures", "linkedin", "profiles")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="directory of saved profile pages")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.fixtures, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not pages:
+        raise SystemExit(f"No .html fixtures found in {args.fixtures}")
+
+    cache = ProfileCache()
+    print(f"{'fixture':<30} {'size':>8} {'parse ms':>10} {'cached ms':>10}")
+    for name, html in pages:
+        url = f"https://www.linkedin.com/in/{os.path.splitext(name)[0]}/"
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            parse_profile_html(html, url)
+        parse_ms = (time.perf_counter() - start) / args.iterations * 1000
+
+        cache.parse(html, url)
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            cache.parse(html, url)
+        cached_ms = (time.perf_counter() - start) / args.iterations * 1000
+        print(f"{name:<30} {len(html):>8} {parse_ms:>10.3f} {cached_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare the pooled scraper engine against one fresh browser per profile.
+
+Runs entirely offline against the local fixture server; needs Chrome and
+chromedriver on PATH.
+
+    python -m benchmarks.bench_scraper --profiles 20 --pool-size 4
+"""
+import argparse
+import time
+
+from benchmarks.fixture_server import start_fixture_server
+from linkedin_scraper import ScraperEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--min-interval", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    urls = ["/in/jane-doe/"] * args.profiles
+    try:
+        start = time.perf_counter()
+        for url in urls:
+            with ScraperEngine("user@example.com", "secret", pool_size=1, base_url=base_url,
+                               min_interval=args.min_interval) as engine:
+                engine.fetch(url)
+        cold = time.perf_counter() - start
+
+        with ScraperEngine("user@example.com", "secret", pool_size=args.pool_size, base_url=base_url,
+                           min_interval=args.min_interval) as engine:
+            start = time.perf_counter()
+            pages = engine.fetch_many(urls)
+            warm = time.perf_counter() - start
+        assert all("Jane Doe" in page for page in pages.values())
+    finally:
+        server.shutdown()
+
+    print(f"fresh browser per profile: {cold:.2f}s ({cold / args.profiles * 1000:.0f} ms/profile)")
+    print(f"pooled, {args.pool_size} sessions:     {warm:.2f}s ({warm / args.profiles * 1000:.0f} ms/profile)")
+
+
+if __name__ == "__main__":
+    main()
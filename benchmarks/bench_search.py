@@ -0,0 +1,120 @@
+"""Compare FTS5 search latency with a LIKE scan over resume text.
+
+Seeds a temporary SQLite database with --rows synthetic resumes, indexed
+through `search_index` as the API does, plus an uncompressed side table
+holding the same text for the LIKE baseline (the real `Resume.content`
+is compressed and cannot be scanned by SQL at all).
+
+    python -m benchmarks.bench_search --rows 100000 --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import text
+
+WORDS = ("python kubernetes terraform react postgres kafka spark rust golang java "
+         "scala airflow docker aws azure gcp django fastapi pandas pytorch").split()
+
+QUERIES = ["python", "kubernetes terraform", "pyt", "rust golang aws", "nonexistentterm"]
+
+
+def _fields(i, rng):
+    skills = ", ".join(rng.sample(WORDS, 5))
+    return {
+        "summary": f"Engineer number {i} focused on {rng.choice(WORDS)} and {rng.choice(WORDS)} systems",
+        "experience": "\n".join(
+            f"Company {rng.randint(1, 5000)} - Engineer\nBuilt {rng.choice(WORDS)} pipelines serving {rng.randint(1, 99)}M users"
+            for _ in range(rng.randint(1, 4))
+        ),
+        "education": f"University {rng.randint(1, 300)} - BSc Computer Science",
+        "skills": skills,
+        "certificates": f"{rng.choice(WORDS).upper()} Certified Professional" if rng.random() < 0.3 else "",
+    }
+
+
+def seed(db, rows, batch_size=5000):
+    import resume_store
+    import search_index
+    from database import Resume, User
+
+    rng = random.Random(0)
+    columns = ", ".join(search_index.INDEXED_FIELDS)
+    db.execute(text(f"CREATE TABLE resume_text (id INTEGER PRIMARY KEY, {columns})"))
+    plain = text(f"INSERT INTO resume_text (id, {columns}) "
+                 f"VALUES (:rowid, {', '.join(':' + f for f in search_index.INDEXED_FIELDS)})")
+    fts = text(f"INSERT INTO {search_index.FTS_TABLE} (rowid, {columns}) "
+               f"VALUES (:rowid, {', '.join(':' + f for f in search_index.INDEXED_FIELDS)})")
+    for start in range(0, rows, batch_size):
+        users, resumes, params = [], [], []
+        for i in range(start, min(start + batch_size, rows)):
+            fields = _fields(i, rng)
+            users.append({"id": i + 1, "name": f"User {i}", "email": f"user{i}@example.com"})
+            resumes.append({"id": i + 1, "user_id": i + 1, "template_style": "modern",
+                            "score": 50, "content": resume_store.pack_resume(fields)})
+            params.append({"rowid": i + 1, **fields})
+        db.bulk_insert_mappings(User, users)
+        db.bulk_insert_mappings(Resume, resumes)
+        db.execute(plain, params)
+        db.execute(fts, params)
+        db.commit()
+
+
+def like_scan(db, query, limit):
+    clauses, params = [], {}
+    for n, term in enumerate(query.split()):
+        params[f"t{n}"] = f"%{term}%"
+        clauses.append("(" + " OR ".join(f"{f} LIKE :t{n}" for f in
+                                         ("summary", "experience", "education", "skills", "certificates")) + ")")
+    where = " AND ".join(clauses)
+    total = db.execute(text(f"SELECT count(*) FROM resume_text WHERE {where}"), params).scalar()
+    db.execute(text(f"SELECT id FROM resume_text WHERE {where} LIMIT :limit"), {**params, "limit": limit}).all()
+    return total
+
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10, help="runs per query, the median is reported")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        from database import SessionLocal, init_db
+        import search_index
+
+        init_db()
+        search_index.init_search_index()
+        db = SessionLocal()
+        start = time.perf_counter()
+        seed(db, args.rows)
+        print(f"seeded {args.rows:,} resumes in {time.perf_counter() - start:.1f} s")
+
+        print(f"{'query':<20} {'fts ms':>8} {'like ms':>9} {'fts hits':>9} {'like hits':>10}")
+        for query in QUERIES:
+            fts_ms, found = _time(lambda: search_index.search(db, query, limit=args.limit), args.repeat)
+            like_ms, like_total = _time(lambda: like_scan(db, query, args.limit), args.repeat)
+            # LIKE matches substrings and FTS stems words, so hit counts differ slightly
+            print(f"{query:<20} {fts_ms:>8.2f} {like_ms:>9.2f} {found['total']:>9} {like_total:>10}")
+
+        start = time.perf_counter()
+        search_index.rebuild_index(db)
+        print(f"rebuild_index: {time.perf_counter() - start:.1f} s")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
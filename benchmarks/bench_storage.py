@@ -0,0 +1,79 @@
+"""Measure storage of compressed resume content versus retained PDFs.
+
+Renders a sample of synthetic resumes, compares the rendered PDF size with
+the packed `Resume.content` size under zlib (and zstd when installed), and
+extrapolates both to --rows resumes.
+
+    python -m benchmarks.bench_storage --sample 200 --rows 1000000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import zlib
+from types import SimpleNamespace
+
+from benchmarks.api_load import _synthetic_resume
+import resume_store
+from pdf_generator import render_resume
+
+
+def _realistic(i):
+    resume = _synthetic_resume(i)
+    jobs = random.randint(2, 6)
+    resume["experience"] = "\n".join(
+        f"Company {j} - Engineer\n0{j % 9 + 1}/201{j} - 12/202{j % 4}\n"
+        + "\n".join(f"- Delivered project {k} improving metric {k * 7}% for team {j}" for k in range(random.randint(2, 5)))
+        for j in range(jobs)
+    )
+    resume["certificates"] = "\n".join(f"Certificate {j} - Issuer {j}" for j in range(random.randint(0, 3)))
+    return resume
+
+
+def _mib(n):
+    return n / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sample", type=int, default=200, help="resumes to render and pack")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="scale to extrapolate to")
+    args = parser.parse_args()
+
+    resumes = [_realistic(i) for i in range(args.sample)]
+    pdf_sizes, raw_sizes, zlib_sizes, packed_sizes = [], [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "r.pdf")
+        for resume in resumes:
+            render_resume(SimpleNamespace(website="", linkedin="", github="", **resume), path)
+            pdf_sizes.append(os.path.getsize(path))
+            raw = json.dumps(resume, separators=(",", ":")).encode()
+            raw_sizes.append(len(raw))
+            zlib_sizes.append(len(zlib.compress(raw, 9)) + 1)
+            packed_sizes.append(len(resume_store.pack_resume(resume)))
+
+    start = time.perf_counter()
+    for resume in resumes:
+        resume_store.unpack_resume(resume_store.pack_resume(resume))
+    roundtrip_us = (time.perf_counter() - start) / len(resumes) * 1e6
+
+    codec = "zstd" if resume_store.zstandard is not None else "zlib"
+    rows = [
+        ("rendered PDF", statistics.mean(pdf_sizes)),
+        ("raw JSON", statistics.mean(raw_sizes)),
+        ("zlib content", statistics.mean(zlib_sizes)),
+        (f"packed ({codec})", statistics.mean(packed_sizes)),
+    ]
+    print(f"{'representation':<16} {'avg bytes':>10} {f'at {args.rows:,} rows':>18}")
+    for label, mean in rows:
+        print(f"{label:<16} {mean:>10.0f} {_mib(mean * args.rows):>14.1f} MiB")
+    saved = rows[0][1] - rows[3][1]
+    print(f"storing content instead of retaining PDFs saves {_mib(saved * args.rows):.1f} MiB "
+          f"({saved / rows[0][1]:.0%}); pack+unpack {roundtrip_us:.0f} us/resume")
+
+
+if __name__ == "__main__":
+    main()
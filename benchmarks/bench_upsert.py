@@ -0,0 +1,157 @@
+"""Check the single-transaction resume insert under concurrency and measure its commit cost.
+
+1. Concurrency: starts the API (optionally with several workers) and
+   fires --burst simultaneous first-time /generate_resume requests per
+   email for --emails new emails. Every request must succeed, and each
+   email must end up with exactly one user and --burst resumes. The exit
+   status is 1 otherwise.
+2. Commit cost: times the database part of the old request path (SELECT,
+   INSERT user, commit, refresh, INSERT resume, commit, refresh) against
+   the new one (upsert ... RETURNING, INSERT resume, one commit). Both
+   run in-process on the same SQLite file.
+
+    python -m benchmarks.bench_upsert --emails 20 --burst 8 --workers 2 --iterations 500
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+from benchmarks.api_load import _free_port, _synthetic_resume, seed_database, start_server
+
+
+async def burst(base_url, emails, size):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60,
+                                 limits=httpx.Limits(max_connections=len(emails) * size)) as client:
+        requests = [client.post("/generate_resume", json=_synthetic_resume(i, email))
+                    for i, email in enumerate(emails) for _ in range(size)]
+        return await asyncio.gather(*requests, return_exceptions=True)
+
+
+def check_concurrency(workdir, args):
+    from sqlalchemy import func
+    from database import Resume, SessionLocal, User
+
+    emails = [f"burst{i}@example.com" for i in range(args.emails)]
+    proc, base_url = start_server(workdir, _free_port(), ["--workers", str(args.workers)])
+    try:
+        responses = asyncio.run(burst(base_url, emails, args.burst))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+    failures = [r if isinstance(r, Exception) else f"{r.status_code} {r.text}"
+                for r in responses if isinstance(r, Exception) or r.status_code != 200]
+    db = SessionLocal()
+    try:
+        users = dict(db.query(User.email, func.count(User.id)).filter(User.email.in_(emails)).group_by(User.email))
+        resumes = dict(db.query(User.email, func.count(Resume.id)).join(Resume, Resume.user_id == User.id)
+                       .filter(User.email.in_(emails)).group_by(User.email))
+    finally:
+        db.close()
+    problems = [f"{email}: {users.get(email, 0)} users, {resumes.get(email, 0)} resumes"
+                for email in emails if users.get(email) != 1 or resumes.get(email) != args.burst]
+
+    print(f"{len(responses)} concurrent requests for {len(emails)} new emails, {args.workers} worker(s): "
+          f"{len(responses) - len(failures)} succeeded")
+    for failure in failures[:5]:
+        print(f"  failed: {failure}")
+    for problem in problems[:5]:
+        print(f"  wrong rows: {problem}")
+    return not failures and not problems
+
+
+def old_path(db, request):
+    from database import Resume, User
+
+    user = db.query(User).filter(User.email == request.email).first()
+    if not user:
+        user = User(name=request.name, email=request.email, title=request.title)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    resume = Resume(user_id=user.id, template_style=request.template_style, score=50,
+                    pdf_path="bench.pdf", downloaded_count=0)
+    db.add(resume)
+    db.commit()
+    db.refresh(resume)
+
+
+def new_path(db, request):
+    import app
+    from database import Resume
+
+    user_id = app.upsert_user(db, request)
+    resume = Resume(user_id=user_id, template_style=request.template_style, score=50,
+                    pdf_path="bench.pdf", downloaded_count=0, created_at=datetime.utcnow())
+    db.add(resume)
+    db.flush()
+    app.ResumeResponse.from_orm(resume)
+    db.commit()
+
+
+def commit_cost(iterations):
+    import app
+    from database import SessionLocal, engine
+    from sqlalchemy import event
+
+    counts = {"statements": 0, "commits": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(*_):
+        counts["statements"] += 1
+
+    @event.listens_for(engine, "commit")
+    def _count_commit(*_):
+        counts["commits"] += 1
+
+    print(f"\n{'path':<6} {'emails':<9} {'ms/request':>11} {'statements':>11} {'commits':>8}")
+    for label, path in (("old", old_path), ("new", new_path)):
+        for kind in ("new", "existing"):
+            requests = [app.ResumeRequest(**_synthetic_resume(i, f"{label}{i if kind == 'new' else 0}@example.com"))
+                        for i in range(iterations)]
+            db = SessionLocal()
+            if kind == "existing":
+                path(db, requests[0])
+            counts.update(statements=0, commits=0)
+            start = time.perf_counter()
+            for request in requests:
+                path(db, request)
+            elapsed = time.perf_counter() - start
+            db.close()
+            print(f"{label:<6} {kind:<9} {elapsed / iterations * 1000:>11.3f} "
+                  f"{counts['statements'] / iterations:>11.1f} {counts['commits'] / iterations:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=8, help="simultaneous requests per email")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.makedirs(os.path.join(workdir, "static", "resumes"))
+    # Admission control would reject parts of the bursts themselves; this
+    # checks correctness, so every request has to reach the database
+    os.environ.update(RENDER_RATE_PER_MINUTE="0", RENDER_QUEUE_SIZE="100000", RENDER_QUEUE_TIMEOUT="3600")
+    try:
+        seed_database(workdir, users=100, resumes=100)
+        ok = check_concurrency(workdir, args)
+        commit_cost(args.iterations)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Measure API throughput as the number of worker processes grows.
+
+Seeds one temporary database, then for each --workers count starts
+`uvicorn app:app --workers N` against it and runs the same load as
+`benchmarks.api_load`. CPU-bound endpoints such as `generate_resume`
+(PDF rendering) and `token` (bcrypt) should scale with the number of cores.
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --endpoints generate_resume token
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+
+from benchmarks.api_load import ENDPOINTS, _free_port, print_header, print_row, run_load, seed_database, start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--resumes", type=int, default=4000)
+    parser.add_argument("--requests", type=int, default=400, help="requests per endpoint and worker count")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--endpoints", nargs="+", default=["generate_resume", "token", "user_resumes"],
+                        choices=ENDPOINTS)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"{os.cpu_count()} CPUs available")
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.makedirs(os.path.join(workdir, "static", "resumes"))
+    throughput = {}
+    try:
+        seed_database(workdir, args.users, args.resumes)
+        for workers in args.workers:
+            proc, base_url = start_server(workdir, _free_port(), ["--workers", str(workers)])
+            try:
+                print(f"\n{workers} worker(s)")
+                print_header()
+                results = asyncio.run(run_load(base_url, args))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=60)
+            throughput[workers] = {endpoint: r["throughput"] for endpoint, r in results.items()}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    base = args.workers[0]
+    print(f"\nspeedup over {base} worker(s)")
+    print(f"{'endpoint':<18}" + "".join(f"{w:>8}w" for w in args.workers))
+    for endpoint in args.endpoints:
+        print(f"{endpoint:<18}" + "".join(
+            f"{throughput[w][endpoint] / throughput[base][endpoint]:>8.2f}x" for w in args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Serve the saved LinkedIn HTML fixtures so the scraper can run offline.
+
+Routes mirror the real site: /login, /feed/ and /in/<slug>/ which maps to
+fixtures/linkedin/profiles/<slug>.html.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import os
+import threading
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "linkedin")
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def _resolve(self, path):
+        path = urlparse(path).path.rstrip("/")
+        if path == "/login":
+            return os.path.join(FIXTURES_DIR, "login.html")
+        if path == "/feed":
+            return os.path.join(FIXTURES_DIR, "feed.html")
+        if path.startswith("/in/"):
+            slug = os.path.basename(path)
+            return os.path.join(FIXTURES_DIR, "profiles", f"{slug}.html")
+        return None
+
+    def do_GET(self):
+        file_path = self._resolve(self.path)
+        if not file_path or not os.path.exists(file_path):
+            self.send_error(404)
+            return
+        with open(file_path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(host="127.0.0.1", port=0):
+    """Start the server in a daemon thread and return (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    server, base_url = start_fixture_server(port=8765)
+    print(f"Serving fixtures at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
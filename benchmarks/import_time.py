@@ -0,0 +1,91 @@
+"""Report import cost and time-to-first-request of the API process.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter and
+lists the slowest imports, then starts uvicorn and measures how long it
+takes until the first request is answered.
+
+    python -m benchmarks.import_time --top 20 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.api_load import REPO_ROOT, _free_port
+
+
+def _env(workdir):
+    return dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+    )
+
+
+def import_times(workdir, module="app"):
+    """Return [(cumulative_us, self_us, name)] for every module imported by `module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workdir, env=_env(workdir), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def time_to_first_request(workdir):
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=workdir, env=_env(workdir),
+    )
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Server exited with code {proc.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/healthz", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--runs", type=int, default=3, help="server starts to average over")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, "static", "resumes"))
+        rows = import_times(workdir, args.module)
+        total = next((cum for cum, _, name in rows if name.strip() == args.module), 0)
+        print(f"import {args.module}: {total / 1000:.1f} ms total")
+        # Only direct dependencies of the module, i.e. one indentation level below it
+        direct = [r for r in rows if r[2].startswith("   ") and not r[2].startswith("    ")]
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for cumulative, self_us, name in sorted(direct, reverse=True)[:args.top]:
+            print(f"{cumulative / 1000:>14.1f} {self_us / 1000:>9.1f}  {name.strip()}")
+
+        timings = [time_to_first_request(workdir) for _ in range(args.runs)]
+        print(f"time to first request: median {statistics.median(timings) * 1000:.0f} ms "
+              f"(min {min(timings) * 1000:.0f}, max {max(timings) * 1000:.0f}, {args.runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
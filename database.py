@@ -1,25 +1,63 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, text, Boolean, func
+from sqlalchemy import create_engine, event, exc, inspect, Column, Integer, String, ForeignKey, DateTime, text, Boolean, func, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import logging
 import os
+import time
 from dotenv import load_dotenv
+from sqlalchemy.sql import sqltypes
 from typing import Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Handlers are set up by the application (see log_config)
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_builder.db")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False}  # Needed for SQLite
 )
 
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    connection_record.info["pid"] = os.getpid()
+    if engine.dialect.name != "sqlite":
+        return
+    # WAL lets readers in other worker processes proceed during a write, and
+    # busy_timeout makes writers wait for the lock instead of failing at once
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    # A connection inherited across fork() shares its socket or file handle
+    # with the parent; discard it and let the pool open a fresh one
+    pid = os.getpid()
+    if connection_record.info["pid"] != pid:
+        connection_record.connection = connection_proxy.connection = None
+        raise exc.DisconnectionError(
+            f"Connection record belongs to pid {connection_record.info['pid']}, attempting to check out in pid {pid}"
+        )
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        # Logged with the request id of the request that ran it
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+
 # Create declarative base
 Base = declarative_base()
 
@@ -55,7 +93,7 @@ class Resume(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     template_style = Column(String)
-    content = Column(String)
+    content = Column(LargeBinary)  # compressed ResumeRequest, see resume_store
     score = Column(Integer, default=0)
     feedback = Column(String)
     pdf_path = Column(String)
@@ -74,10 +112,47 @@ def get_db():
     finally:
         db.close()
 
+# Resume.content was a String column before it held compressed bytes.
+# create_all never alters an existing column, so convert it here.
+BINARY_COLUMN_MIGRATIONS = {
+    "postgresql": "ALTER TABLE resumes ALTER COLUMN content TYPE bytea USING convert_to(content, 'UTF8')",
+    "mysql": "ALTER TABLE resumes MODIFY content LONGBLOB",
+}
+
+def _content_is_binary(bind) -> bool:
+    columns = {column["name"]: column["type"] for column in inspect(bind).get_columns("resumes")}
+    return isinstance(columns["content"], sqltypes._Binary)
+
+def migrate_resume_content(bind=engine):
+    """Turn a text `resumes.content` column from before compressed storage into a binary one"""
+    # SQLite stores bytes in a column of any declared type
+    if bind.dialect.name == "sqlite" or _content_is_binary(bind):
+        return
+    statement = BINARY_COLUMN_MIGRATIONS.get(bind.dialect.name)
+    if statement is None:
+        raise RuntimeError(
+            f"resumes.content must be a binary column; convert it manually on {bind.dialect.name}"
+        )
+    logger.info("Converting resumes.content to a binary column")
+    try:
+        with bind.begin() as conn:
+            conn.execute(text(statement))
+    except exc.DBAPIError:
+        # Another worker process may have converted it first
+        if not _content_is_binary(bind):
+            raise
+
 def init_db():
     try:
-        # Create tables
-        Base.metadata.create_all(bind=engine)
+        # Create tables. Worker processes starting together can race between
+        # the existence check and CREATE TABLE; the loser just checks again.
+        try:
+            Base.metadata.create_all(bind=engine)
+        except exc.OperationalError as e:
+            if "already exists" not in str(e):
+                raise
+            Base.metadata.create_all(bind=engine)
+        migrate_resume_content(engine)
         logger.info("Database tables created successfully")
         
         # Test database connection
@@ -88,14 +163,15 @@ def init_db():
             db.commit()
             logger.info("Database connection test successful")
         except Exception as e:
-            logger.error(f"Database connection test failed: {str(e)}")
+            logger.error("Database connection test failed: %s", e)
             raise
         finally:
             db.close()
             
     except Exception as e:
-        logger.error(f"Database initialization error: {str(e)}")
+        logger.error("Database initialization error: %s", e)
         raise
 
-# Initialize database
-init_db()
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    init_db()
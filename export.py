@@ -0,0 +1,158 @@
+"""Streaming bulk export of users and resumes.
+
+Rows are read from a streaming cursor in batches and encoded batch by
+batch, so an export runs in constant memory regardless of table size.
+"""
+from typing import Iterable, Iterator, List
+import csv
+import io
+import json
+import zlib
+
+from sqlalchemy import Boolean, DateTime, Integer, select
+
+from database import Resume, User, engine
+
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_TABLES = {
+    "users": (User, ["id", "name", "email", "title", "phone", "location",
+                     "website", "linkedin", "github", "created_at"]),
+    "resumes": (Resume, ["id", "user_id", "template_style", "score", "pdf_path",
+                         "downloaded_count", "created_at"]),
+}
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def iter_batches(table: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+    """Yield lists of row tuples from a streaming (server-side where supported) cursor"""
+    model, columns = EXPORT_TABLES[table]
+    query = select(*[getattr(model, c) for c in columns]).order_by(model.id)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(query)
+        for partition in result.partitions(batch_size):
+            yield [tuple(row) for row in partition]
+
+
+def _iso(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def csv_chunks(batches: Iterable[List[tuple]], columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([[_iso(v) for v in row] for row in batch])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(batches: Iterable[List[tuple]], columns: List[str]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps({c: _iso(v) for c, v in zip(columns, row)}) + "\n" for row in batch
+        ).encode("utf-8")
+
+
+class _ChunkSink:
+    """Write-only file object collecting bytes until drained.
+
+    Parquet writes absolute offsets into its footer, so the position must
+    keep counting across drains rather than restart like a truncated BytesIO.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parquet_chunks(batches: Iterable[List[tuple]], columns: List[str], table: str) -> Iterator[bytes]:
+    """One row group per batch; requires the optional pyarrow dependency"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    model = EXPORT_TABLES[table][0]
+    types = []
+    for column in columns:
+        sql_type = getattr(model, column).type
+        if isinstance(sql_type, Integer):
+            types.append(pa.int64())
+        elif isinstance(sql_type, DateTime):
+            types.append(pa.timestamp("us"))
+        elif isinstance(sql_type, Boolean):
+            types.append(pa.bool_())
+        else:
+            types.append(pa.string())
+    schema = pa.schema(list(zip(columns, types)))
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for batch in batches:
+        arrays = [pa.array(list(values), type=t) for values, t in zip(zip(*batch), types)]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(table: str, fmt: str, compress: bool = False,
+                  batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Encoded export of `table` as an iterator of byte chunks"""
+    columns = EXPORT_TABLES[table][1]
+    batches = iter_batches(table, batch_size)
+    if fmt == "csv":
+        chunks = csv_chunks(batches, columns)
+    elif fmt == "ndjson":
+        chunks = ndjson_chunks(batches, columns)
+    else:
+        chunks = parquet_chunks(batches, columns, table)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -1,5 +1,7 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import requests
+import api_client
 import pandas as pd
 from datetime import datetime
 import json
@@ -11,7 +13,7 @@ import io
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-API_URL = "http://127.0.0.1:8090"
+PUBLIC_API_URL = api_client.PUBLIC_API_URL
 
 # Page config
 st.set_page_config(
@@ -106,38 +108,46 @@ def create_resume():
             ["modern", "professional", "creative", "minimal", "executive"]
         )
         
-        submitted = st.form_submit_button("Generate Resume")
+        col1, col2 = st.columns(2)
+        with col1:
+            previewed = st.form_submit_button("👁️ Preview")
+        with col2:
+            submitted = st.form_submit_button("Generate Resume")
+        
+        if (submitted or previewed) and (not name or not email):
+            st.error("Please fill in all required fields marked with *")
+            return
+        
+        resume_data = {
+            "name": name,
+            "email": email,
+            "title": title,
+            "phone": phone,
+            "location": location,
+            "website": website,
+            "linkedin": linkedin,
+            "github": github,
+            "summary": summary,
+            "experience": experience,
+            "education": education,
+            "skills": skills,
+            "languages": languages,
+            "certificates": certificates,
+            "template_style": template_style
+        }
+        
+        if previewed:
+            try:
+                components.html(api_client.preview_resume(resume_data), height=900, scrolling=True)
+            except api_client.APIError as e:
+                st.error(f"Error previewing resume: {e.status_code} - {e.text}")
+            except requests.exceptions.RequestException as e:
+                st.error(f"Failed to connect to the server. Please try again later. Error: {str(e)}")
         
         if submitted:
-            if not name or not email:
-                st.error("Please fill in all required fields marked with *")
-                return
-            
             try:
                 with st.spinner("Generating your resume..."):
-                    resume_data = {
-                        "name": name,
-                        "email": email,
-                        "title": title,
-                        "phone": phone,
-                        "location": location,
-                        "website": website,
-                        "linkedin": linkedin,
-                        "github": github,
-                        "summary": summary,
-                        "experience": experience,
-                        "education": education,
-                        "skills": skills,
-                        "languages": languages,
-                        "certificates": certificates,
-                        "template_style": template_style
-                    }
-                    
-                    response = requests.post(
-                        f"{API_URL}/generate_resume",
-                        json=resume_data,
-                        timeout=30
-                    )
+                    response = api_client.generate_resume(resume_data)
                     
                     if response.status_code == 200:
                         result = response.json()
@@ -151,15 +161,18 @@ def create_resume():
                                 file_name=f"resume_{name.lower().replace(' ', '_')}.pdf",
                                 mime="application/pdf"
                             )
+                    elif response.status_code in (429, 503):
+                        retry_after = response.headers.get("Retry-After", "a few")
+                        st.warning(f"The server is busy right now. Please try again in {retry_after} seconds.")
                     else:
                         st.error(f"Error: {response.status_code} - {response.text}")
                         
             except requests.exceptions.RequestException as e:
                 st.error(f"Failed to connect to the server. Please try again later. Error: {str(e)}")
-                logger.error(f"Error generating resume: {str(e)}")
+                logger.error("Error generating resume: %s", e)
             except Exception as e:
                 st.error(f"An unexpected error occurred. Please try again. Error: {str(e)}")
-                logger.error(f"Unexpected error: {str(e)}")
+                logger.error("Unexpected error: %s", e)
 
 def view_resumes():
     st.title("Your Resume History")
@@ -168,47 +181,42 @@ def view_resumes():
     
     if email:
         try:
-            response = requests.get(
-                f"{API_URL}/user/resumes/{email}",
-                timeout=10
-            )
+            resumes = api_client.get_user_resumes(email)
             
-            if response.status_code == 200:
-                resumes = response.json()
-                if resumes:
-                    # Statistics
-                    st.subheader("📊 Resume Statistics")
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Total Resumes", len(resumes))
-                    with col2:
-                        total_downloads = sum(r["downloaded_count"] for r in resumes)
-                        st.metric("Total Downloads", total_downloads)
-                    with col3:
-                        avg_score = sum(r["score"] for r in resumes) / len(resumes)
-                        st.metric("Average Score", f"{avg_score:.1f}/100")
-                    
-                    # Resume List
-                    st.subheader("📄 Your Resumes")
-                    for resume in resumes:
-                        with st.expander(f"Resume {resume['id']} - {resume['template_style'].title()} Style"):
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.markdown(f"**Created:** {resume['created_at']}")
-                                st.markdown(f"**Template:** {resume['template_style'].title()}")
-                            with col2:
-                                st.markdown(f"**Score:** {resume['score']}/100")
-                                st.markdown(f"**Downloads:** {resume['downloaded_count']}")
-                            
-                            st.markdown("---")
-                            st.markdown(f"[📥 Download Resume](http://localhost:8090/download_resume/{resume['id']})")
-                else:
-                    st.info("No resumes found. Create your first resume!")
-                    if st.button("Create Resume Now"):
-                        st.session_state["page"] = "Create Resume"
-                        st.experimental_rerun()
+            if resumes:
+                # Statistics
+                st.subheader("📊 Resume Statistics")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total Resumes", len(resumes))
+                with col2:
+                    total_downloads = sum(r["downloaded_count"] for r in resumes)
+                    st.metric("Total Downloads", total_downloads)
+                with col3:
+                    avg_score = sum(r["score"] for r in resumes) / len(resumes)
+                    st.metric("Average Score", f"{avg_score:.1f}/100")
+                
+                # Resume List
+                st.subheader("📄 Your Resumes")
+                for resume in resumes:
+                    with st.expander(f"Resume {resume['id']} - {resume['template_style'].title()} Style"):
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.markdown(f"**Created:** {resume['created_at']}")
+                            st.markdown(f"**Template:** {resume['template_style'].title()}")
+                        with col2:
+                            st.markdown(f"**Score:** {resume['score']}/100")
+                            st.markdown(f"**Downloads:** {resume['downloaded_count']}")
+                        
+                        st.markdown("---")
+                        st.markdown(f"[📥 Download Resume]({PUBLIC_API_URL}/download_resume/{resume['id']})")
             else:
-                st.error(f"Error fetching resumes: {response.status_code} - {response.text}")
+                st.info("No resumes found. Create your first resume!")
+                if st.button("Create Resume Now"):
+                    st.session_state["page"] = "Create Resume"
+                    st.experimental_rerun()
+        except api_client.APIError as e:
+            st.error(f"Error fetching resumes: {e.status_code} - {e.text}")
         except Exception as e:
             st.error(f"Failed to fetch resumes. Please try again. Error: {str(e)}")
 
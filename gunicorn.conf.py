@@ -0,0 +1,61 @@
+"""Production server configuration: `gunicorn -c gunicorn.conf.py app:app`
+
+Runs the API in N uvicorn worker processes under a gunicorn master, which
+restarts crashed workers and supports graceful restarts:
+
+    kill -HUP <master pid>    # start new workers, drain and stop the old ones
+    kill -TERM <master pid>   # stop accepting, drain in-flight requests, exit
+
+Every setting can be overridden with the environment variables below.
+"""
+import multiprocessing
+import os
+import shutil
+
+bind = os.getenv("BIND", f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8090')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Seconds a worker gets to finish in-flight requests after HUP/TERM
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# A worker silent for this long is killed and replaced
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Recycle workers periodically so slow leaks cannot accumulate; the jitter
+# keeps them from all restarting at the same moment
+max_requests = int(os.getenv("MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "500"))
+
+# The app is imported in each worker after fork, so no connection pool,
+# cache or lock is ever shared between processes
+preload_app = False
+
+loglevel = os.getenv("LOG_LEVEL", "info")
+accesslog = os.getenv("ACCESS_LOG") or None
+
+
+def on_starting(server):
+    """Create the schema once in the master, before any worker starts"""
+    from database import engine, init_db
+    from metrics import prepare_multiprocess_dir
+    import search_index
+
+    init_db()
+    search_index.init_search_index()
+    # The master never serves requests; do not hand open connections to workers
+    engine.dispose()
+    # Workers share their metrics through files in METRICS_DIR, so whichever
+    # one accepts a scrape answers with the totals of all of them
+    directory, created = prepare_multiprocess_dir()
+    # Rate limit buckets are shared the same way; admission control also
+    # sizes each worker's render and auth slots by the number of workers
+    os.environ.setdefault("RATE_LIMIT_DB", os.path.join(directory, "rate_limits.db"))
+    os.environ["WEB_CONCURRENCY"] = str(server.num_workers)
+    # Kept on the arbiter, which outlives config reloads on HUP
+    server.created_metrics_dir = directory if created else None
+
+
+def on_exit(server):
+    if getattr(server, "created_metrics_dir", None):
+        shutil.rmtree(server.created_metrics_dir, ignore_errors=True)
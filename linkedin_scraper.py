@@ -1,16 +1,276 @@
 from selenium import webdriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+import atexit
+import logging
+import os
+import threading
 import time
 
-def fetch_linkedin_profile(email, password):
-    driver = webdriver.Chrome()
-    driver.get("https://www.linkedin.com/login")
-
-    driver.find_element("id", "username").send_keys(email)
-    driver.find_element("id", "password").send_keys(password + Keys.RETURN)
-    
-    time.sleep(5)  # Wait for page load
-    profile_data = driver.page_source  # Scrape data
-    driver.quit()
-    
-    return profile_data
+logger = logging.getLogger(__name__)
+
+LINKEDIN_BASE_URL = os.getenv("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "2"))
+SCRAPER_MIN_INTERVAL = float(os.getenv("SCRAPER_MIN_INTERVAL", "2.0"))
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "15"))
+
+
+def _default_driver_factory(headless: bool = True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    # Images are never part of the scraped data, skip downloading them
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    return webdriver.Chrome(options=options)
+
+
+class BrowserSession:
+    """A logged-in browser that is rate limited to one page load per `min_interval` seconds"""
+
+    def __init__(self, driver, min_interval: float, timeout: float):
+        self.driver = driver
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self._last_request = 0.0
+
+    def _throttle(self):
+        wait = self._last_request + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_request = time.monotonic()
+
+    def _wait_ready(self):
+        WebDriverWait(self.driver, self.timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+
+    def login(self, base_url: str, email: str, password: str):
+        login_url = f"{base_url}/login"
+        self._throttle()
+        self.driver.get(login_url)
+        wait = WebDriverWait(self.driver, self.timeout)
+        wait.until(EC.presence_of_element_located((By.ID, "username"))).send_keys(email)
+        self.driver.find_element(By.ID, "password").send_keys(password + Keys.RETURN)
+        # Logged in once the browser has navigated away from the login form
+        wait.until(EC.url_changes(login_url))
+        self._wait_ready()
+
+    def get(self, url: str, ready_selector: Optional[str] = None) -> str:
+        self._throttle()
+        self.driver.get(url)
+        self._wait_ready()
+        if ready_selector:
+            WebDriverWait(self.driver, self.timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+            )
+        return self.driver.page_source
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning("Error closing browser session: %s", e)
+
+
+class ScraperEngine:
+    """Bounded pool of warm, logged-in headless browser sessions.
+
+    Sessions are created and logged in once, then checked out for each fetch
+    and returned to the pool, so concurrent fetches never share a browser.
+    Point `base_url` at a local fixture server to run fully offline.
+    """
+
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        pool_size: int = SCRAPER_POOL_SIZE,
+        base_url: str = LINKEDIN_BASE_URL,
+        min_interval: float = SCRAPER_MIN_INTERVAL,
+        timeout: float = SCRAPER_TIMEOUT,
+        headless: bool = True,
+        driver_factory: Optional[Callable[[], object]] = None,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.email = email
+        self.password = password
+        self.pool_size = pool_size
+        self.base_url = base_url.rstrip("/")
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.driver_factory = driver_factory or (lambda: _default_driver_factory(headless))
+        self._idle: "deque[BrowserSession]" = deque()
+        self._sessions = []
+        self._creating = 0  # slots reserved by sessions still logging in
+        self._lock = threading.Lock()
+        # Signalled whenever a session goes idle or a slot is freed
+        self._available = threading.Condition(self._lock)
+        self._closed = False
+
+    def _new_session(self) -> BrowserSession:
+        session = BrowserSession(self.driver_factory(), self.min_interval, self.timeout)
+        try:
+            session.login(self.base_url, self.email, self.password)
+        except Exception:
+            session.close()
+            raise
+        return session
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if len(self._sessions) + self._creating >= self.pool_size:
+                return False
+            self._creating += 1
+            return True
+
+    def _create_reserved(self) -> BrowserSession:
+        """Start and log in a session for a reserved slot.
+
+        Runs outside the lock, so a slow login never holds up callers
+        taking or returning other sessions. The slot is given back if
+        creation fails.
+        """
+        try:
+            session = self._new_session()
+        except Exception:
+            with self._available:
+                self._creating -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._creating -= 1
+            closed = self._closed
+            if not closed:
+                self._sessions.append(session)
+                ready = len(self._sessions)
+        if closed:
+            session.close()
+            raise RuntimeError("ScraperEngine is closed")
+        logger.info("Browser session ready (%d/%d)", ready, self.pool_size)
+        return session
+
+    def start(self, warm: Optional[int] = None):
+        """Log in `warm` sessions up front (all of them by default)"""
+        for _ in range(min(warm or self.pool_size, self.pool_size)):
+            if not self._reserve_slot():
+                break
+            session = self._create_reserved()
+            self._release(session)
+        return self
+
+    def _acquire(self) -> BrowserSession:
+        wait = self.timeout * 4
+        deadline = time.monotonic() + wait
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("ScraperEngine is closed")
+                if self._idle:
+                    return self._idle.popleft()
+                # Grow lazily up to pool_size, otherwise wait for a session or a free slot
+                if len(self._sessions) + self._creating < self.pool_size:
+                    self._creating += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser session became available within {wait:g}s")
+                self._available.wait(remaining)
+        return self._create_reserved()
+
+    def _release(self, session: BrowserSession, healthy: bool = True):
+        with self._available:
+            if healthy and not self._closed:
+                self._idle.append(session)
+                self._available.notify()
+                return
+            if session in self._sessions:
+                self._sessions.remove(session)
+            # The slot is free again; a waiter can start a replacement
+            self._available.notify()
+        session.close()
+
+    def fetch(self, url: str, ready_selector: Optional[str] = "main") -> str:
+        """Return the page source of `url` (absolute or relative to base_url)"""
+        if not url.startswith(("http://", "https://")):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        session = self._acquire()
+        healthy = True
+        try:
+            return session.get(url, ready_selector)
+        except Exception:
+            # A browser that failed mid-navigation is in an unknown state, replace it
+            healthy = False
+            raise
+        finally:
+            self._release(session, healthy)
+
+    def fetch_many(self, urls: Iterable[str], ready_selector: Optional[str] = "main") -> Dict[str, str]:
+        """Fetch several profiles concurrently, at most one per pooled session"""
+        urls = list(urls)
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            pages = executor.map(lambda u: self.fetch(u, ready_selector), urls)
+            return dict(zip(urls, pages))
+
+    def close(self):
+        with self._available:
+            self._closed = True
+            sessions, self._sessions = self._sessions, []
+            self._idle.clear()
+            self._available.notify_all()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_engines: Dict[tuple, ScraperEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(email: str, password: str, **kwargs) -> ScraperEngine:
+    """Return the shared engine for these credentials, creating it on first use"""
+    key = (email, password, kwargs.get("base_url", LINKEDIN_BASE_URL))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = ScraperEngine(email, password, **kwargs)
+    return engine
+
+
+@atexit.register
+def close_engines():
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.close()
+
+
+def fetch_linkedin_profile(email, password, profile_url: Optional[str] = None):
+    engine = get_engine(email, password)
+    # Without a profile URL, return the landing page after login as before
+    return engine.fetch(profile_url or "/feed/", ready_selector=None)
+
+
+def fetch_structured_profile(email, password, profile_url: str, max_age: Optional[float] = 3600):
+    """Scrape and parse a profile, reusing a recent parse of the same URL instead of re-scraping"""
+    from profile_parser import profile_cache
+
+    profile = profile_cache.get(profile_url, max_age=max_age)
+    if profile is not None:
+        return profile
+    page_source = fetch_linkedin_profile(email, password, profile_url)
+    return profile_cache.parse(page_source, profile_url)
@@ -0,0 +1,458 @@
+"""Minimal Prometheus-compatible metrics.
+
+Metrics are plain in-process counters guarded by a lock, so recording a
+sample costs a dict lookup and an addition. `REGISTRY.render()` produces
+the Prometheus text exposition format served by `/metrics`.
+
+With several worker processes, a scrape reaches whichever worker accepts
+the connection. When METRICS_DIR is set (the production launchers set
+it), each worker writes its samples to a file there every
+METRICS_FLUSH_INTERVAL seconds, and every worker answers a scrape with
+the totals across all of them: counters and histograms include workers
+that have exited or been recycled, gauges are summed over live workers.
+Samples carry no per-worker label, so series stay stable across restarts.
+"""
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import atexit
+import fcntl
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (2_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _parse(text: str) -> "OrderedDict[str, dict]":
+    """Exposition text to {family: {"help", "type", "samples": {series: value}}}"""
+    families: "OrderedDict[str, dict]" = OrderedDict()
+    family = None
+    for line in text.splitlines():
+        if line.startswith("# HELP ") or line.startswith("# TYPE "):
+            _, kind, name, rest = (line.split(" ", 3) + [""])[:4]
+            family = families.setdefault(name, {"help": "", "type": "untyped", "samples": OrderedDict()})
+            family["help" if kind == "HELP" else "type"] = rest
+        elif line and family is not None:
+            series, _, value = line.rpartition(" ")
+            family["samples"][series] = float(value)
+    return families
+
+
+def _merge(into: "OrderedDict[str, dict]", families: "OrderedDict[str, dict]", types: Optional[Sequence[str]] = None):
+    """Add the samples of `families` (only those of `types`, if given) to `into`"""
+    for name, family in families.items():
+        if types is not None and family["type"] not in types:
+            continue
+        target = into.setdefault(name, {"help": family["help"], "type": family["type"], "samples": OrderedDict()})
+        for series, value in family["samples"].items():
+            target["samples"][series] = target["samples"].get(series, 0) + value
+
+
+def _format(families: "OrderedDict[str, dict]") -> str:
+    lines = []
+    for name, family in families.items():
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        lines.extend(f"{series} {_format_value(value)}" for series, value in family["samples"].items())
+    return "\n".join(lines) + "\n"
+
+
+# Totals of exited workers; they only matter for metrics that accumulate
+_CUMULATIVE = ("counter", "histogram")
+_ARCHIVE = "archive.prom"
+
+
+def prepare_multiprocess_dir() -> Tuple[str, bool]:
+    """For launchers: point METRICS_DIR at an empty directory before any worker starts.
+
+    Returns the directory and whether it was created here (and should be
+    removed by the launcher when it exits).
+    """
+    global METRICS_DIR
+    directory, created = os.environ.get("METRICS_DIR"), False
+    if not directory:
+        directory, created = tempfile.mkdtemp(prefix="resume-metrics-"), True
+    # Both, for forked workers that already imported this module and for spawned ones
+    METRICS_DIR = os.environ["METRICS_DIR"] = directory
+    os.makedirs(directory, exist_ok=True)
+    # Files of a previous run would be added to this run's totals
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    return directory, created
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labelvalues: Tuple) -> Tuple[str, ...]:
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+        return tuple(str(v) for v in labelvalues)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, *labelvalues, value: float):
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, *labelvalues):
+        self.inc(*labelvalues)
+        try:
+            yield
+        finally:
+            self.dec(*labelvalues)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, *labelvalues, value: float):
+        key = self._key(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(*labelvalues, value=time.perf_counter() - start)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(state[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._directory: Optional[str] = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]):
+        """Register a callable producing exposition lines at scrape time"""
+        self._collectors.append(collector)
+
+    def render_local(self) -> str:
+        """This process's samples only"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+    def render(self) -> str:
+        if self._directory is None:
+            return self.render_local()
+        return self._render_shared()
+
+    def enable_multiprocess(self, directory: str, interval: float = METRICS_FLUSH_INTERVAL):
+        """Share this process's samples through `directory`; call once per worker, after fork"""
+        self._directory = directory
+        self._interval = interval
+        self._path = os.path.join(directory, f"worker-{os.getpid()}-{uuid.uuid4().hex[:8]}.prom")
+        self._flush_lock = threading.Lock()
+        self._exited = False
+        self._flush()
+
+        def flush_periodically():
+            while True:
+                time.sleep(interval)
+                self._flush()
+
+        threading.Thread(target=flush_periodically, name="metrics-flush", daemon=True).start()
+        atexit.register(self._flush_final)
+
+    def _flush(self):
+        text = self.render_local()
+        with self._flush_lock:
+            if not self._exited:
+                _write(self._path, text)
+
+    def _flush_final(self):
+        # An exited worker's counters are folded into the archive by the next scrape
+        self._flush()
+        with self._flush_lock, self._directory_lock():
+            self._exited = True
+            os.replace(self._path, f"{os.path.splitext(self._path)[0]}.dead")
+
+    @contextmanager
+    def _directory_lock(self):
+        with open(os.path.join(self._directory, "lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _render_shared(self) -> str:
+        self._flush()
+        totals: "OrderedDict[str, dict]" = OrderedDict()
+        stale_before = time.time() - 3 * self._interval
+        with self._directory_lock():
+            archive_path = os.path.join(self._directory, _ARCHIVE)
+            archive = _parse(_read(archive_path))
+            exited = []
+            for name in sorted(os.listdir(self._directory)):
+                if name == _ARCHIVE or not name.endswith((".prom", ".dead")):
+                    continue
+                path = os.path.join(self._directory, name)
+                stale = os.path.getmtime(path) < stale_before
+                families = _parse(_read(path))
+                if name.endswith(".dead") or (stale and not _pid_alive(name)):
+                    # Exited, or killed before it could say so
+                    _merge(archive, families, _CUMULATIVE)
+                    exited.append(path)
+                else:
+                    # A worker that has stopped flushing no longer counts towards gauges
+                    _merge(totals, families, _CUMULATIVE if stale else None)
+            if exited:
+                _write(archive_path, _format(archive))
+                for path in exited:
+                    os.remove(path)
+        _merge(totals, archive)
+        return _format(totals)
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+def _write(path: str, text: str):
+    # Readers in other processes only ever see a complete file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _pid_alive(name: str) -> bool:
+    pid = int(name.split("-")[1])
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+HTTP_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled", ("method",))
+PIPELINE_STAGE = REGISTRY.histogram(
+    "resume_pipeline_stage_seconds", "Time spent in each stage of /generate_resume", ("stage",))
+PDF_SIZE = REGISTRY.histogram(
+    "resume_pdf_size_bytes", "Size of generated resume PDFs", buckets=SIZE_BUCKETS)
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "admission_in_flight", "Requests holding a slot of an endpoint class", ("endpoint_class",))
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    "admission_queue_depth", "Requests waiting for a slot of an endpoint class", ("endpoint_class",))
+ADMISSION_WAIT = REGISTRY.histogram(
+    "admission_wait_seconds", "Time spent queued before being admitted", ("endpoint_class",))
+ADMISSION_REJECTED = REGISTRY.counter(
+    "admission_rejected_total", "Requests turned away by admission control", ("endpoint_class", "reason"))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts and latency per route, and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+        self._route_names: Dict[object, str] = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        name = self._route_names.get(endpoint)
+        if name is None:
+            # Label by route template, never the raw path, to keep cardinality bounded
+            name = "unmatched"
+            for route in getattr(scope.get("app"), "routes", ()):
+                if getattr(route, "endpoint", getattr(route, "app", None)) is endpoint:
+                    name = route.path
+                    break
+            self._route_names[endpoint] = name
+        return name
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        method = scope["method"]
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # The route is only known once routing has run, so in-flight requests are per method
+        HTTP_IN_PROGRESS.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_PROGRESS.dec(method)
+            route = self._route(scope)
+            HTTP_LATENCY.observe(method, route, value=time.perf_counter() - start)
+            HTTP_REQUESTS.inc(method, route, status_code)
+
+
+def instrument_engine(engine, registry: Registry = REGISTRY):
+    """Expose connection pool statistics for a SQLAlchemy engine"""
+    from sqlalchemy import event
+
+    state = {"checked_out": 0, "connects": 0, "checkouts": 0}
+    lock = threading.Lock()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        with lock:
+            state["connects"] += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with lock:
+            state["checked_out"] += 1
+            state["checkouts"] += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        with lock:
+            state["checked_out"] -= 1
+
+    def collect():
+        with lock:
+            snapshot = dict(state)
+        pool = engine.pool
+        yield "# HELP db_pool_checked_out Connections currently checked out of the pool"
+        yield "# TYPE db_pool_checked_out gauge"
+        yield f"db_pool_checked_out {snapshot['checked_out']}"
+        yield "# HELP db_pool_checkouts_total Connections checked out of the pool"
+        yield "# TYPE db_pool_checkouts_total counter"
+        yield f"db_pool_checkouts_total {snapshot['checkouts']}"
+        yield "# HELP db_pool_connects_total New DBAPI connections opened"
+        yield "# TYPE db_pool_connects_total counter"
+        yield f"db_pool_connects_total {snapshot['connects']}"
+        if hasattr(pool, "size") and hasattr(pool, "overflow"):
+            yield "# HELP db_pool_size Configured pool size"
+            yield "# TYPE db_pool_size gauge"
+            yield f"db_pool_size {pool.size()}"
+            yield "# HELP db_pool_overflow Connections opened beyond the pool size"
+            yield "# TYPE db_pool_overflow gauge"
+            yield f"db_pool_overflow {pool.overflow()}"
+
+    registry.add_collector(collect)
@@ -1,15 +1,276 @@
-from fpdf import FPDF
+from fpdf import FPDF, set_global
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import logging
+import os
+import threading
+import unicodedata
+
+from resume_layout import BULLET, TEMPLATE_COLORS, iter_lines, resume_layout
+
+logger = logging.getLogger(__name__)
+
+# Parsed fonts are cached in-process (see `_install_font`); stop FPDF from
+# writing .pkl metric files next to the font files
+set_global("FPDF_CACHE_MODE", 1)
+
+BODY_LINE_HEIGHT = 6
+
+# TrueType faces used when available, so any script renders; the core
+# Helvetica font only covers latin-1
+FONT_FAMILY = "ResumeSans"
+FONT_SEARCH_DIRS = [
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+    "/usr/share/fonts/TTF",
+    "/usr/local/share/fonts",
+    "/Library/Fonts",
+    os.path.expanduser("~/.fonts"),
+]
+FONT_FILES = {"": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf", "I": "DejaVuSans-Oblique.ttf"}
+# auto: embed the TTF only when the text has characters the core fonts
+# cannot show (embedding costs ~30x the render time and ~20 KB per face);
+# always: embed for a consistent look; never: always use Helvetica
+EMBED_FONTS = os.getenv("RESUME_EMBED_FONTS", "auto")
+
+_fonts: Optional[Dict[str, str]] = None
+_font_cache: Dict[tuple, tuple] = {}
+_font_lock = threading.Lock()
+
+
+def find_fonts() -> Dict[str, str]:
+    """Map of style ('', 'B', 'I') to TTF path; empty if no usable regular face is found.
+
+    RESUME_FONT_PATH (regular) and optionally RESUME_FONT_BOLD_PATH /
+    RESUME_FONT_ITALIC_PATH take precedence over the DejaVu search.
+    """
+    global _fonts
+    if _fonts is not None:
+        return _fonts
+    configured = {
+        "": os.getenv("RESUME_FONT_PATH"),
+        "B": os.getenv("RESUME_FONT_BOLD_PATH"),
+        "I": os.getenv("RESUME_FONT_ITALIC_PATH"),
+    }
+    fonts = {}
+    if configured[""]:
+        fonts = {style: path for style, path in configured.items() if path and os.path.exists(path)}
+    else:
+        for directory in FONT_SEARCH_DIRS:
+            if os.path.exists(os.path.join(directory, FONT_FILES[""])):
+                fonts = {style: os.path.join(directory, name) for style, name in FONT_FILES.items()
+                         if os.path.exists(os.path.join(directory, name))}
+                break
+    if "" not in fonts:
+        logger.warning("No TrueType font found, PDFs fall back to latin-1 Helvetica; set RESUME_FONT_PATH")
+        fonts = {}
+    _fonts = fonts
+    return fonts
+
+
+def _install_font(pdf: FPDF, style: str, path: str):
+    """Add a TTF face to `pdf`, parsing the font file only once per process.
+
+    `FPDF.add_font` re-reads the whole TTF for its metrics on every
+    document. The parsed entry is captured from a throwaway document and
+    copied into each new one; only the glyph subset is per document.
+    """
+    key = (style, path)
+    with _font_lock:
+        cached = _font_cache.get(key)
+        if cached is None:
+            probe = FPDF()
+            probe.add_font(FONT_FAMILY, style, path, uni=True)
+            fontkey = FONT_FAMILY.lower() + style
+            font = probe.fonts[fontkey]
+            cached = _font_cache[key] = (font, dict(probe.font_files), _MissingGlyphs(font["cw"]))
+    font, font_files, glyphs = cached
+    # `subset` collects the glyphs this document uses and is consumed on output
+    pdf.fonts[font["fontkey"]] = dict(font, i=len(pdf.fonts) + 1, subset=list(font["subset"]))
+    for name, entry in font_files.items():
+        pdf.font_files[name] = dict(entry)
+    pdf.glyph_tables[font["fontkey"]] = glyphs
+
+
+class _MissingGlyphs(dict):
+    """`str.translate` table replacing characters a TTF face has no glyph for.
+
+    FPDF fails on output when text uses a code point past the end of the
+    font's width table (emoji, or CJK with a Latin-only face).
+    """
+
+    def __init__(self, widths: List[int]):
+        super().__init__()
+        self.widths = widths
+
+    def __missing__(self, codepoint: int) -> str:
+        covered = codepoint < 32 or (codepoint < len(self.widths) and self.widths[codepoint])
+        replacement = chr(codepoint) if covered else "?"
+        self[codepoint] = replacement
+        return replacement
+
+
+class _Latin1Fallback(dict):
+    """`str.translate` table folding text into what the core fonts can show.
+
+    Latin-1 passes through, other cp1252 characters (•, –, “, €...) map to
+    their byte since the core fonts use WinAnsiEncoding, letters outside
+    both lose their accent (ő -> o) and anything else becomes '?'.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        try:
+            replacement = chr(char.encode("cp1252")[0])
+        except UnicodeEncodeError:
+            base = unicodedata.normalize("NFKD", char).encode("ascii", "ignore").decode("ascii")
+            replacement = base or "?"
+        self[codepoint] = replacement
+        return replacement
+
+
+_latin1_fallback = _Latin1Fallback((i, chr(i)) for i in range(256))
+
+
+class ResumePDF(FPDF):
+    """FPDF document with the resume styles shared by every render path"""
+
+    def __init__(self, template_style: str = "modern", header_text: str = "", unicode: bool = True):
+        super().__init__()
+        self.colors = TEMPLATE_COLORS.get(template_style, TEMPLATE_COLORS["modern"])
+        self.header_text = header_text
+        self.set_auto_page_break(True, margin=15)
+        self.glyph_tables = {}
+        fonts = find_fonts() if unicode else {}
+        for style, path in fonts.items():
+            _install_font(self, style, path)
+        self.font_name = FONT_FAMILY if fonts else "Helvetica"
+        self.font_styles = set(fonts) if fonts else {"", "B", "I"}
+
+    def set_font(self, family, style='', size=0):
+        if family == self.font_name and style not in self.font_styles:
+            style = "B" if "B" in style and "B" in self.font_styles else ""
+        super().set_font(family, style, size)
+
+    def normalize_text(self, txt):
+        txt = super().normalize_text(txt)
+        if not isinstance(txt, str):
+            return txt
+        if self.unifontsubset:
+            return txt.translate(self.glyph_tables[self.current_font["fontkey"]])
+        return txt.translate(_latin1_fallback)
 
-class PDF(FPDF):
     def header(self):
-        self.set_font("Arial", "B", 12)
-        self.cell(200, 10, "Generated Resume", ln=True, align="C")
+        if self.header_text:
+            self.set_font(self.font_name, 'B', 12)
+            self.set_text_color(*self.colors["primary"])
+            self.cell(0, 10, self.header_text, ln=True, align='C')
 
-def generate_pdf(resume_text, filename="resume.pdf"):
-    pdf = PDF()
+    def write_heading(self, name: str, title: str, contact: Iterable[str], online: Iterable[str]):
+        self.set_font(self.font_name, 'B', 24)
+        self.set_text_color(*self.colors["primary"])
+        self.cell(0, 20, name, ln=True, align='C')
+
+        self.set_font(self.font_name, 'I', 16)
+        self.set_text_color(*self.colors["secondary"])
+        self.cell(0, 10, title, ln=True, align='C')
+
+        self.set_font(self.font_name, '', 10)
+        self.set_text_color(*self.colors["primary"])
+        self.cell(0, 10, " | ".join(contact), ln=True, align='C')
+
+        online = list(online)
+        if online:
+            self.ln(5)
+            self.cell(0, 10, " | ".join(online), ln=True, align='C')
+
+    def write_section_title(self, heading: str):
+        self.ln(10)
+        self.set_font(self.font_name, 'B', 14)
+        self.set_text_color(*self.colors["primary"])
+        self.cell(0, 10, heading, ln=True)
+        self.set_font(self.font_name, '', 11)
+        self.set_text_color(0, 0, 0)
+
+    def write_lines(self, lines: Iterable[str], skip_blank: bool = True):
+        """Lay out text line by line; FPDF breaks pages as each line is placed"""
+        for line in lines:
+            if not line.strip():
+                if not skip_blank:
+                    self.ln(BODY_LINE_HEIGHT)
+                continue
+            if line.startswith(BULLET):
+                self.cell(10)  # Indent bullet points
+            self.multi_cell(0, BODY_LINE_HEIGHT, line)
+
+    def write_section(self, section: dict):
+        self.write_section_title(section["heading"])
+        if section["kind"] == "list":
+            self.multi_cell(0, BODY_LINE_HEIGHT, f" {BULLET} ".join(section["items"]))
+        else:
+            self.write_lines(section["lines"], skip_blank=False)
+
+
+def needs_unicode(texts: Iterable[str]) -> bool:
+    """Whether embedding a TTF font is configured or needed to show `texts`"""
+    if EMBED_FONTS != "auto":
+        return EMBED_FONTS == "always"
+    try:
+        for text in texts:
+            text.encode("cp1252")
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+def _layout_texts(layout: dict) -> Iterator[str]:
+    heading = layout["heading"]
+    yield heading["name"]
+    yield heading["title"]
+    yield from heading["contact"]
+    yield from heading["online"]
+    for section in layout["sections"]:
+        yield from section.get("lines", section.get("items", ()))
+
+
+def build_resume_pdf(resume, layout: Optional[dict] = None) -> ResumePDF:
+    """Lay out a `ResumeRequest` (or any object with the same attributes).
+
+    Pass `layout` when the caller already has `resume_layout(resume)`.
+    """
+    if layout is None:
+        layout = resume_layout(resume)
+    pdf = ResumePDF(layout["template_style"], unicode=needs_unicode(_layout_texts(layout)))
+    pdf.add_page()
+    pdf.write_heading(**layout["heading"])
+    for section in layout["sections"]:
+        pdf.write_section(section)
+    return pdf
+
+
+def render_resume(resume, output_path: str, layout: Optional[dict] = None) -> int:
+    """Render a structured resume to `output_path` and return its page count"""
+    pdf = build_resume_pdf(resume, layout)
+    pdf.output(output_path)
+    return pdf.page_no()
+
+
+def render_text(resume_text: Union[str, Iterable[str]], output_path: str,
+                template_style: str = "modern", header_text: str = "Generated Resume") -> int:
+    """Render free-form (e.g. AI generated) text to `output_path` and return its page count"""
+    if isinstance(resume_text, str):
+        unicode = needs_unicode((resume_text, header_text))
+    else:
+        # Checking a stream would consume it
+        unicode = EMBED_FONTS != "never"
+    pdf = ResumePDF(template_style, header_text=header_text, unicode=unicode)
     pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.multi_cell(0, 10, resume_text)
-    pdf.output(filename)
+    pdf.set_font(pdf.font_name, '', 11)
+    pdf.set_text_color(0, 0, 0)
+    pdf.write_lines(iter_lines(resume_text), skip_blank=False)
+    pdf.output(output_path)
+    return pdf.page_no()
+
 
+def generate_pdf(resume_text, filename="resume.pdf"):
+    render_text(resume_text, filename)
     return filename
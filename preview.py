@@ -0,0 +1,101 @@
+"""Fast HTML and JSON previews of a resume.
+
+Previews are drawn from `resume_layout.resume_layout`, the same layout the
+PDF is rendered from, so they show the same sections in the same order and
+template colours without paying for a PDF render. Rendered previews are
+kept in an LRU cache keyed by a hash of the resume content.
+"""
+from collections import OrderedDict
+from html import escape
+from typing import Tuple, Union
+import hashlib
+import json
+import os
+import threading
+
+from resume_layout import BULLET, resume_layout
+
+PREVIEW_CACHE_SIZE = int(os.getenv("PREVIEW_CACHE_SIZE", "512"))
+PREVIEW_FORMATS = ("html", "json")
+
+# Fields that never change how a resume looks
+IGNORED_FIELDS = {"score", "pdf_path"}
+
+
+def content_hash(fields: dict) -> str:
+    visible = {k: v for k, v in fields.items() if k not in IGNORED_FIELDS}
+    return hashlib.sha1(json.dumps(visible, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _rgb(color: Tuple[int, int, int]) -> str:
+    return "rgb({}, {}, {})".format(*color)
+
+
+def render_html(layout: dict) -> str:
+    """Standalone HTML page mirroring the PDF's fonts, sizes and colours"""
+    primary = _rgb(layout["colors"]["primary"])
+    secondary = _rgb(layout["colors"]["secondary"])
+    heading = layout["heading"]
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><style>"
+        "body{font-family:Helvetica,Arial,sans-serif;font-size:11pt;color:#000;max-width:190mm;margin:10mm auto}"
+        f"h1{{font-size:24pt;color:{primary};text-align:center;margin:0}}"
+        f".title{{font-size:16pt;font-style:italic;color:{secondary};text-align:center}}"
+        f".contact{{font-size:10pt;color:{primary};text-align:center}}"
+        f"h2{{font-size:14pt;color:{primary};margin:10mm 0 2mm}}"
+        "p{margin:0;line-height:6mm;min-height:6mm}p.bullet{padding-left:10mm}"
+        "</style></head><body>",
+        f"<h1>{escape(heading['name'])}</h1>",
+        f"<div class=\"title\">{escape(heading['title'])}</div>",
+        f"<div class=\"contact\">{escape(' | '.join(heading['contact']))}</div>",
+    ]
+    if heading["online"]:
+        parts.append(f"<div class=\"contact\">{escape(' | '.join(heading['online']))}</div>")
+
+    for section in layout["sections"]:
+        parts.append(f"<section id=\"{section['field']}\"><h2>{escape(section['heading'])}</h2>")
+        if section["kind"] == "list":
+            parts.append(f"<p>{escape(f' {BULLET} '.join(section['items']))}</p>")
+        else:
+            for line in section["lines"]:
+                css = " class=\"bullet\"" if line.startswith(BULLET) else ""
+                parts.append(f"<p{css}>{escape(line)}</p>")
+        parts.append("</section>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+class PreviewCache:
+    """LRU cache of rendered previews keyed by (content hash, format)"""
+
+    def __init__(self, maxsize: int = PREVIEW_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Union[str, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, resume, fmt: str = "html") -> Union[str, dict]:
+        key = (content_hash(resume.dict()), fmt)
+        with self._lock:
+            preview = self._entries.get(key)
+            if preview is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return preview
+            self.misses += 1
+        layout = resume_layout(resume)
+        preview = render_html(layout) if fmt == "html" else layout
+        with self._lock:
+            self._entries[key] = preview
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return preview
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+preview_cache = PreviewCache()
@@ -0,0 +1,196 @@
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import logging
+import threading
+import time
+
+from lxml import etree, html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_SIZE = 512
+
+# Compiled once; lxml evaluates compiled XPath noticeably faster than ad-hoc queries
+_find_section = etree.XPath("//section[.//*[@id=$anchor]]")
+_find_items = etree.XPath("(.//ul)[1]/li")
+_find_name = etree.XPath("//h1[1]")
+_find_headline = etree.XPath("//*[contains(@class, 'text-body-medium')][1]")
+_find_location = etree.XPath("//*[contains(@class, 'pv-top-card')]//*[contains(@class, 'text-body-small')][1]")
+_find_visible = etree.XPath(".//span[@aria-hidden='true']")
+
+
+@dataclass
+class ParsedProfile:
+    """Structured LinkedIn profile using the same field names as `ResumeRequest`"""
+    name: str = ""
+    title: str = ""
+    location: str = ""
+    linkedin: str = ""
+    summary: str = ""
+    experience: str = ""
+    education: str = ""
+    skills: str = ""
+    languages: str = ""
+    certificates: str = ""
+    content_hash: str = field(default="", repr=False)
+
+    def to_resume_fields(self) -> Dict[str, str]:
+        """Fields ready to be passed to `ResumeRequest(**fields, email=..., template_style=...)`"""
+        fields = asdict(self)
+        fields.pop("content_hash")
+        # Keep ResumeRequest's own defaults for anything the profile didn't have
+        return {k: v for k, v in fields.items() if v}
+
+
+def _clean(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _text(element) -> str:
+    # LinkedIn duplicates every label in a visually-hidden span for screen
+    # readers; the aria-hidden span holds the single visible copy
+    visible = _find_visible(element)
+    if visible:
+        return _clean(visible[0].text_content())
+    return _clean(element.text_content())
+
+
+def _first_text(tree, xpath) -> str:
+    found = xpath(tree)
+    return _clean(found[0].text_content()) if found else ""
+
+
+def _section_items(tree, anchor: str) -> List[Tuple[List[str], List[str]]]:
+    """Return (lines, bullets) for each entry of the section anchored at `anchor`"""
+    sections = _find_section(tree, anchor=anchor)
+    if not sections:
+        return []
+    items = []
+    for li in _find_items(sections[0]):
+        lines, bullets = [], []
+        for child in li:
+            if child.tag == "ul":
+                bullets.extend(t for t in (_text(b) for b in child.findall("li")) if t)
+            else:
+                text = _text(child)
+                if text:
+                    lines.append(text)
+        if lines:
+            items.append((lines, bullets))
+    return items
+
+
+def _organisation(line: str) -> str:
+    # "Acme Corp · Full-time" -> "Acme Corp"
+    return line.split(" · ")[0].strip()
+
+
+def _format_experience(items) -> str:
+    entries = []
+    for lines, bullets in items:
+        title = lines[0]
+        company = _organisation(lines[1]) if len(lines) > 1 else ""
+        entry = [f"{company} - {title}" if company else title]
+        entry.extend(lines[2:3])
+        entry.extend(f"• {b}" for b in bullets)
+        entries.append("\n".join(entry))
+    return "\n".join(entries)
+
+
+def _format_education(items) -> str:
+    entries = []
+    for lines, bullets in items:
+        school = lines[0]
+        entry = [f"{lines[1]} - {school}" if len(lines) > 1 else school]
+        entry.extend(lines[2:3])
+        entry.extend(f"• {b}" for b in bullets)
+        entries.append("\n".join(entry))
+    return "\n".join(entries)
+
+
+def _format_certificates(items) -> str:
+    return "\n".join(
+        f"{lines[0]} - {_organisation(lines[1])}" if len(lines) > 1 else lines[0]
+        for lines, _ in items
+    )
+
+
+def _format_list(items) -> str:
+    return ", ".join(lines[0] for lines, _ in items)
+
+
+def content_hash(page_source: str) -> str:
+    return hashlib.sha1(page_source.encode("utf-8")).hexdigest()
+
+
+def parse_profile_html(page_source: str, profile_url: str = "") -> ParsedProfile:
+    """Extract the resume-relevant sections from a LinkedIn profile page"""
+    tree = lxml_html.fromstring(page_source)
+    about = _find_section(tree, anchor="about")
+    return ParsedProfile(
+        name=_first_text(tree, _find_name),
+        title=_first_text(tree, _find_headline),
+        location=_first_text(tree, _find_location),
+        linkedin=profile_url,
+        summary=_text(about[0]) if about else "",
+        experience=_format_experience(_section_items(tree, "experience")),
+        education=_format_education(_section_items(tree, "education")),
+        skills=_format_list(_section_items(tree, "skills")),
+        languages=_format_list(_section_items(tree, "languages")),
+        certificates=_format_certificates(_section_items(tree, "licenses_and_certifications")),
+        content_hash=content_hash(page_source),
+    )
+
+
+class ProfileCache:
+    """LRU cache of parsed profiles keyed by (profile URL, content hash)"""
+
+    def __init__(self, maxsize: int = PROFILE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], ParsedProfile]" = OrderedDict()
+        self._latest: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, page_source: str, profile_url: str = "") -> ParsedProfile:
+        key = (profile_url, content_hash(page_source))
+        with self._lock:
+            profile = self._entries.get(key)
+            if profile is not None:
+                self._entries.move_to_end(key)
+                self._latest[profile_url] = (key[1], time.monotonic())
+                self.hits += 1
+                return profile
+            self.misses += 1
+        profile = parse_profile_html(page_source, profile_url)
+        with self._lock:
+            self._entries[key] = profile
+            self._latest[profile_url] = (key[1], time.monotonic())
+            while len(self._entries) > self.maxsize:
+                (url, digest), _ = self._entries.popitem(last=False)
+                if self._latest.get(url, ("",))[0] == digest:
+                    del self._latest[url]
+        return profile
+
+    def get(self, profile_url: str, max_age: Optional[float] = None) -> Optional[ParsedProfile]:
+        """Most recently parsed version of `profile_url`, if it is younger than `max_age` seconds"""
+        with self._lock:
+            latest = self._latest.get(profile_url)
+            if latest is None:
+                return None
+            digest, parsed_at = latest
+            if max_age is not None and time.monotonic() - parsed_at > max_age:
+                return None
+            return self._entries.get((profile_url, digest))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self.hits = self.misses = 0
+
+
+profile_cache = ProfileCache()
@@ -0,0 +1,173 @@
+"""Opt-in per-request profiling.
+
+`ProfilingMiddleware` is only installed when PROFILING_ENABLED is set, so
+a disabled deployment pays nothing. When installed, a request to one of
+the target paths is profiled with cProfile if it carries `X-Profile: 1`
+together with a valid admin bearer token, or if it is picked by the
+PROFILE_SAMPLE_RATE sampler. The pstats output is written to PROFILE_DIR
+and its id is returned in the `X-Profile-Id` response header; admins can
+fetch it from `/admin/profiles/{profile_id}`.
+
+cProfile only sees the thread it runs in. The event loop thread is
+profiled for the whole request, and work the request hands to the
+threadpool (PDF rendering) is wrapped with `profiled`, which profiles it
+in its worker thread and merges the result into the request's profile.
+Other coroutines that run on the loop while the request awaits show up
+too, so only one request is profiled at a time.
+"""
+from contextvars import ContextVar
+from typing import Callable, Iterable, List, Optional
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_PATHS = tuple(p for p in os.getenv("PROFILE_PATHS", "/generate_resume,/download_resume").split(",") if p)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[0-9]+-[a-z0-9_]+$")
+
+# Profiles of threadpool work done for the request being profiled; copied
+# into worker threads along with the rest of the request's context
+_thread_profiles: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar("thread_profiles", default=None)
+_profiling_thread = threading.local()
+
+
+def profiled(func):
+    """Profile `func` into the current request's profile when that request is being profiled.
+
+    For functions run with `run_in_threadpool`, which the request's own
+    profiler cannot see. Costs a context variable lookup otherwise.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiles = _thread_profiles.get()
+        # A thread has one profiler at a time; nested calls are already covered
+        if profiles is None or getattr(_profiling_thread, "active", False):
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        _profiling_thread.active = True
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            _profiling_thread.active = False
+            profiles.append(profiler)
+    return wrapper
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app,
+        authorize: Callable[[str], bool],
+        paths: Iterable[str] = PROFILE_PATHS,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        output_dir: str = PROFILE_DIR,
+        keep: int = PROFILE_KEEP,
+    ):
+        self.app = app
+        self.authorize = authorize
+        self.paths = tuple(paths)
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.keep = keep
+        self._busy = threading.Lock()
+
+    def _requested(self, scope) -> bool:
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"1":
+            return False
+        scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+        return scheme.lower() == "bearer" and bool(token) and self.authorize(token)
+
+    def _should_profile(self, scope) -> bool:
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            return False
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        return self._requested(scope)
+
+    async def __call__(self, scope, receive, send):
+        if not self._should_profile(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        slug = re.sub(r"[^a-z0-9]+", "_", scope["path"].lower()).strip("_") or "root"
+        profile_id = f"{int(time.time() * 1000)}-{os.getpid()}-{slug}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        thread_profiles: List[cProfile.Profile] = []
+        token = _thread_profiles.set(thread_profiles)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            _thread_profiles.reset(token)
+            self._busy.release()
+            self._save(profiler, thread_profiles, profile_id)
+
+    def _save(self, profiler: cProfile.Profile, thread_profiles: List[cProfile.Profile], profile_id: str):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stats = pstats.Stats(profiler)
+            if thread_profiles:
+                stats.add(*thread_profiles)
+            stats.dump_stats(os.path.join(self.output_dir, f"{profile_id}.prof"))
+            logger.info("Saved request profile: %s", profile_id)
+            for stale in list_profiles(self.output_dir)[self.keep:]:
+                os.remove(os.path.join(self.output_dir, f"{stale['id']}.prof"))
+        except OSError as e:
+            logger.error("Error saving request profile: %s", e)
+
+
+def list_profiles(output_dir: str = PROFILE_DIR) -> List[dict]:
+    """Stored profiles, newest first"""
+    if not os.path.isdir(output_dir):
+        return []
+    profiles = []
+    for name in os.listdir(output_dir):
+        profile_id, ext = os.path.splitext(name)
+        if ext != ".prof" or not PROFILE_ID_PATTERN.match(profile_id):
+            continue
+        created_ms, pid, path = profile_id.split("-", 2)
+        profiles.append({
+            "id": profile_id,
+            "path": path,
+            "pid": int(pid),
+            "created_at": int(created_ms) / 1000,
+            "size": os.path.getsize(os.path.join(output_dir, name)),
+        })
+    profiles.sort(key=lambda p: p["created_at"], reverse=True)
+    return profiles
+
+
+def profile_path(profile_id: str, output_dir: str = PROFILE_DIR) -> Optional[str]:
+    """Path of a stored profile, or None for unknown or malformed ids"""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(output_dir, f"{profile_id}.prof")
+    return path if os.path.exists(path) else None
+
+
+def profile_summary(path: str, sort: str = "cumulative", limit: int = 50) -> str:
+    """Human readable pstats report for a stored profile"""
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,94 @@
+"""Renderer-independent resume layout.
+
+Splits a `ResumeRequest` into its heading and sections, in render order,
+with the template colours. The PDF renderer, the HTML/JSON previews and
+the scorer all work from this structure. It does not import fpdf, so the
+API can lay out and score resumes without loading the PDF library.
+"""
+from typing import Iterable, Iterator, List, Union
+
+# Set colors based on template
+TEMPLATE_COLORS = {
+    "modern": {"primary": (44, 62, 80), "secondary": (52, 152, 219)},
+    "professional": {"primary": (52, 73, 94), "secondary": (46, 204, 113)},
+    "creative": {"primary": (142, 68, 173), "secondary": (231, 76, 60)},
+    "minimal": {"primary": (44, 62, 80), "secondary": (149, 165, 166)},
+    "executive": {"primary": (44, 62, 80), "secondary": (241, 196, 15)}
+}
+
+# Resume sections in render order: (field, heading, kind)
+#   paragraph - free text
+#   lines     - one entry per line, lines starting with a bullet are indented
+#   list      - comma-separated items joined with bullets
+RESUME_SECTIONS = [
+    ("summary", "Professional Summary", "paragraph"),
+    ("experience", "Professional Experience", "lines"),
+    ("education", "Education", "lines"),
+    ("skills", "Skills", "list"),
+    ("languages", "Languages", "list"),
+    ("certificates", "Certifications", "lines"),
+]
+
+BULLET = '•'
+
+
+def iter_lines(text: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yield lines one at a time without splitting the whole text up front.
+
+    Accepts a string or any iterable of lines (e.g. an open file), so very
+    long documents never need to be held as a list of lines.
+    """
+    if not isinstance(text, str):
+        for line in text:
+            yield line.rstrip('\n')
+        return
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def split_section(kind: str, value: str) -> dict:
+    """Split a section's raw text into the entries it is laid out as.
+
+    `lines` sections also carry `line_count`, the number of lines as typed
+    (blank separators included, surrounding whitespace not), which is what
+    the resume score counts.
+    """
+    if kind == "list":
+        return {"items": [item.strip() for item in value.split(',')]}
+    if kind == "paragraph":
+        return {"lines": list(iter_lines(value))}
+    return {
+        "lines": [line for line in iter_lines(value) if line.strip()],
+        "line_count": value.strip().count('\n') + 1,
+    }
+
+
+def resume_layout(resume) -> dict:
+    """Renderer-independent layout of a `ResumeRequest` (or any object with the same attributes).
+
+    The PDF and the HTML/JSON preview are both drawn from this structure,
+    so they always show the same sections in the same order and colours.
+    """
+    contact = [v for v in (resume.email, resume.phone, resume.location) if v]
+    online = []
+    if resume.website: online.append(f"Website: {resume.website}")
+    if resume.linkedin: online.append(f"LinkedIn: {resume.linkedin}")
+    if resume.github: online.append(f"GitHub: {resume.github}")
+
+    sections: List[dict] = []
+    for field, heading, kind in RESUME_SECTIONS:
+        value = getattr(resume, field)
+        if value:
+            sections.append({"field": field, "heading": heading, "kind": kind, **split_section(kind, value)})
+    return {
+        "template_style": resume.template_style,
+        "colors": TEMPLATE_COLORS.get(resume.template_style, TEMPLATE_COLORS["modern"]),
+        "heading": {"name": resume.name, "title": resume.title, "contact": contact, "online": online},
+        "sections": sections,
+    }
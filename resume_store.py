@@ -0,0 +1,79 @@
+"""Compact storage of resume content.
+
+The canonical `ResumeRequest` is stored compressed in `Resume.content`;
+the rendered PDF is a cache derived from it that may be evicted and is
+rebuilt on demand. zstd is used when the optional `zstandard` package is
+installed, zlib otherwise. A one byte prefix records the codec so rows
+written with either remain readable.
+"""
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import zlib
+
+logger = logging.getLogger(__name__)
+
+CODEC_ZLIB = b"\x01"
+CODEC_ZSTD = b"\x02"
+
+# Not part of the resume itself; recomputed or reassigned on every render
+EXCLUDED_FIELDS = {"score", "pdf_path"}
+
+try:
+    import zstandard
+    _zstd_compressor = zstandard.ZstdCompressor(level=10)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+except ImportError:
+    zstandard = None
+
+
+def pack_resume(resume) -> bytes:
+    """Serialize a `ResumeRequest` (or a dict of its fields) to compressed bytes"""
+    fields = resume if isinstance(resume, dict) else resume.dict()
+    payload = json.dumps(
+        {k: v for k, v in fields.items() if k not in EXCLUDED_FIELDS and v not in ("", None)},
+        separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    if zstandard is not None:
+        return CODEC_ZSTD + _zstd_compressor.compress(payload)
+    return CODEC_ZLIB + zlib.compress(payload, 9)
+
+
+def unpack_resume(blob: bytes) -> dict:
+    """Inverse of `pack_resume`; returns the stored fields as a dict"""
+    codec, data = blob[:1], blob[1:]
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Resume content is zstd compressed but zstandard is not installed")
+        payload = _zstd_decompressor.decompress(data)
+    elif codec == CODEC_ZLIB:
+        payload = zlib.decompress(data)
+    else:
+        raise ValueError(f"Unknown resume content codec: {codec!r}")
+    return json.loads(payload)
+
+
+def evict_pdfs(db, older_than_days: int = 30, batch_size: int = 1000) -> dict:
+    """Delete cached PDFs of resumes whose content is stored and can be re-rendered"""
+    from database import Resume
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    query = (
+        db.query(Resume.id, Resume.pdf_path)
+        .filter(Resume.content.isnot(None), Resume.created_at < cutoff)
+        .yield_per(batch_size)
+    )
+    evicted, freed = 0, 0
+    for _, pdf_path in query:
+        if pdf_path and os.path.exists(pdf_path):
+            try:
+                size = os.path.getsize(pdf_path)
+                os.remove(pdf_path)
+            except OSError as e:
+                logger.warning("Could not evict %s: %s", pdf_path, e)
+                continue
+            evicted += 1
+            freed += size
+    logger.info("Evicted %d cached PDFs (%d bytes)", evicted, freed)
+    return {"evicted": evicted, "bytes_freed": freed}
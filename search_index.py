@@ -0,0 +1,199 @@
+"""Full-text search over resume content.
+
+Backed by an SQLite FTS5 table keyed by resume id. The table is
+contentless (`content=''`): it holds only the inverted index, since the
+text itself lives compressed in `Resume.content`. Rows are indexed in the
+same transaction that inserts the resume. `rebuild_index` repopulates the
+index from stored content into a shadow table and swaps it in, so search
+and new resumes keep working while it runs.
+"""
+from typing import Dict, Optional
+import logging
+import re
+import threading
+import uuid
+
+from sqlalchemy import exc, text
+
+import resume_store
+from database import Resume, User, engine
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "resume_fts"
+FTS_MODULE = "fts5"
+INDEXED_FIELDS = ("summary", "experience", "education", "skills", "certificates")
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+_fts_support: Dict[object, bool] = {}
+_fts_support_lock = threading.Lock()
+
+
+def _probe_fts(bind) -> bool:
+    # FTS5 may be compiled in or loaded as an extension; creating a throwaway
+    # table in the connection's temp schema is the one check that covers both
+    with bind.connect() as conn:
+        try:
+            conn.execute(text(f"CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts_probe USING {FTS_MODULE}(x)"))
+            conn.execute(text("DROP TABLE temp.fts_probe"))
+        except exc.OperationalError:
+            return False
+    return True
+
+
+def available(bind=engine) -> bool:
+    """Whether `bind` is SQLite with FTS5 support; probed once per engine"""
+    if bind.dialect.name != "sqlite":
+        return False
+    with _fts_support_lock:
+        if bind not in _fts_support:
+            _fts_support[bind] = _probe_fts(bind)
+        return _fts_support[bind]
+
+
+def _create_table(conn, table: str):
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING {FTS_MODULE}("
+        f"{', '.join(INDEXED_FIELDS)}, content='', tokenize='porter unicode61')"
+    ))
+
+
+def _insert(table: str):
+    return text(f"INSERT INTO {table} (rowid, {', '.join(INDEXED_FIELDS)}) "
+                f"VALUES (:rowid, {', '.join(':' + f for f in INDEXED_FIELDS)})")
+
+
+def _row(resume_id: int, fields: dict) -> dict:
+    return {"rowid": resume_id, **{f: fields.get(f) or "" for f in INDEXED_FIELDS}}
+
+
+def init_search_index(bind=engine):
+    if not available(bind):
+        logger.warning("Full-text search needs SQLite FTS5, /admin/search is disabled")
+        return
+    with bind.begin() as conn:
+        _create_table(conn, FTS_TABLE)
+
+
+def index_resume(db, resume_id: int, fields: dict):
+    """Add a resume to the index inside the caller's transaction"""
+    if not available(db.get_bind()):
+        return
+    db.execute(_insert(FTS_TABLE), _row(resume_id, fields))
+
+
+def _index_batch(db, table: str, after_id: int, batch_size: int):
+    """Index the next `batch_size` resumes with an id above `after_id`; returns (count, last id)"""
+    rows = (
+        db.query(Resume.id, Resume.content)
+        .filter(Resume.content.isnot(None), Resume.id > after_id)
+        .order_by(Resume.id)
+        .limit(batch_size)
+        .all()
+    )
+    if not rows:
+        return 0, after_id
+    db.execute(_insert(table), [_row(resume_id, resume_store.unpack_resume(content)) for resume_id, content in rows])
+    return len(rows), rows[-1].id
+
+
+def build_match(query: str, field: Optional[str] = None) -> str:
+    """Turn free text into a safe FTS5 expression: every term must match, the last as a prefix"""
+    terms = _TERM.findall(query)
+    if not terms:
+        return ""
+    quoted = [f'"{t}"' for t in terms[:-1]] + [f'"{terms[-1]}"*']
+    expression = " ".join(quoted)
+    if field:
+        expression = f"{field} : ({expression})"
+    return expression
+
+
+def search(db, query: str, limit: int = 20, offset: int = 0, field: Optional[str] = None) -> dict:
+    """Rank matching resumes with bm25 and return one page of them with their owner"""
+    match = build_match(query, field)
+    if not match:
+        return {"total": 0, "results": []}
+    total = db.execute(
+        text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"), {"match": match}
+    ).scalar()
+    ranked = db.execute(
+        text(f"SELECT rowid, bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} "
+             f"WHERE {FTS_TABLE} MATCH :match ORDER BY rank LIMIT :limit OFFSET :offset"),
+        {"match": match, "limit": limit, "offset": offset}
+    ).all()
+    if not ranked:
+        return {"total": total, "results": []}
+
+    ranks = {row.rowid: row.rank for row in ranked}
+    rows = (
+        db.query(Resume, User.name, User.email)
+        .join(User, User.id == Resume.user_id)
+        .filter(Resume.id.in_(list(ranks)))
+        .all()
+    )
+    by_id = {resume.id: (resume, name, email) for resume, name, email in rows}
+    results = []
+    for resume_id in ranks:  # keep bm25 order
+        if resume_id not in by_id:
+            continue
+        resume, name, email = by_id[resume_id]
+        results.append({
+            "id": resume.id,
+            "user_id": resume.user_id,
+            "name": name,
+            "email": email,
+            "template_style": resume.template_style,
+            "score": resume.score,
+            "created_at": resume.created_at,
+            # bm25 is lower-is-better; expose a higher-is-better relevance
+            "relevance": -ranks[resume_id],
+        })
+    return {"total": total, "results": results}
+
+
+def rebuild_index(db, batch_size: int = 1000) -> int:
+    """Repopulate the index from stored resume content; returns the number of resumes indexed.
+
+    The new index is built in a shadow table, one short transaction per
+    batch, so searches keep using the old index and new resumes are only
+    held up by a single batch at a time. Resumes added meanwhile are
+    indexed into the old table; the final transaction takes the write lock,
+    copies those over and renames the shadow table into place.
+    """
+    bind = db.get_bind()
+    if not available(bind):
+        return 0
+    init_search_index(bind)
+    shadow = f"{FTS_TABLE}_rebuild_{uuid.uuid4().hex[:8]}"
+    with bind.begin() as conn:
+        _create_table(conn, shadow)
+    try:
+        indexed, last_id = 0, 0
+        while True:
+            added, last_id = _index_batch(db, shadow, last_id, batch_size)
+            if not added:
+                break
+            indexed += added
+            db.commit()
+
+        # Nothing can write from here until the swap commits. Resumes are
+        # never deleted and ids only grow, so anything newer is above last_id
+        db.execute(text("BEGIN IMMEDIATE"))
+        while True:
+            added, last_id = _index_batch(db, shadow, last_id, batch_size)
+            if not added:
+                break
+            indexed += added
+        db.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+        db.execute(text(f"ALTER TABLE {shadow} RENAME TO {FTS_TABLE}"))
+        db.commit()
+    except Exception:
+        db.rollback()
+        with bind.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {shadow}"))
+        raise
+    logger.info("Rebuilt search index with %d resumes", indexed)
+    return indexed
@@ -0,0 +1,26 @@
+"""Run the app against a throwaway working directory and SQLite database.
+
+app.py reads its configuration and mounts ./static at import time, so the
+environment is set up here, before any test module imports it.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="resume-tests-")
+atexit.register(shutil.rmtree, WORKDIR, ignore_errors=True)
+
+sys.path.insert(0, REPO_ROOT)
+os.makedirs(os.path.join(WORKDIR, "static", "resumes"))
+os.chdir(WORKDIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORKDIR, 'test.db')}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# Tests send bursts from one client; rate limits would only get in the way
+os.environ.setdefault("RENDER_RATE_PER_MINUTE", "0")
+os.environ.setdefault("AUTH_RATE_PER_MINUTE", "0")
+# Concurrent tests drive the app from several threads, each with its own
+# event loop; render slots must never make one loop wait on another's future
+os.environ.setdefault("RENDER_CONCURRENCY", "64")
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+import admission
+from conftest import REPO_ROOT
+
+
+def test_workers_draw_from_one_shared_bucket(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    # Two limiters on one file stand in for two worker processes
+    first, second = (admission.RateLimiter("render", per_minute=6, burst=3, shared_path=path) for _ in range(2))
+
+    first.check("ada@example.com")
+    second.check("ada@example.com")
+    first.check("ada@example.com")
+    with pytest.raises(HTTPException) as rejected:
+        second.check("ada@example.com")
+    assert rejected.value.status_code == 429
+    assert int(rejected.value.headers["Retry-After"]) >= 5
+    # Other clients have their own bucket
+    second.check("grace@example.com")
+
+
+def test_shared_bucket_admits_when_its_file_is_unusable(tmp_path):
+    limiter = admission.RateLimiter("auth", per_minute=6, burst=1, shared_path=str(tmp_path))  # a directory
+    for _ in range(3):
+        limiter.check("127.0.0.1")
+
+
+def test_slots_default_to_each_workers_share_of_the_cpus():
+    cpus = os.cpu_count() or 1
+    env = {k: v for k, v in os.environ.items() if not k.endswith("_CONCURRENCY")}
+    env.update(PYTHONPATH=REPO_ROOT, WEB_CONCURRENCY=str(cpus))
+    limits = subprocess.run(
+        [sys.executable, "-c", "import admission; print(admission.RENDER.limit, admission.AUTH.limit)"],
+        capture_output=True, text=True, check=True, env=env,
+    ).stdout.split()
+    assert limits == ["1", "1"]
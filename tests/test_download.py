@@ -0,0 +1,76 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+import app
+import resume_store
+
+CONCURRENT_DOWNLOADS = 6
+
+
+def test_evicted_pdf_is_rendered_once_for_concurrent_downloads(monkeypatch):
+    with TestClient(app.app) as client:
+        created = client.post("/generate_resume", json={
+            "name": "Grace Hopper",
+            "email": "grace@example.com",
+            "experience": "Navy - Rear Admiral\n\nHarvard - Research Fellow",
+            "template_style": "minimal",
+        })
+        assert created.status_code == 200
+        resume_id, pdf_path = created.json()["id"], created.json()["pdf_path"]
+        os.remove(pdf_path)
+
+    renders = []
+    render = app.generate_pdf_resume
+
+    def counting_render(request, output_path, layout=None):
+        renders.append(output_path)
+        return render(request, output_path, layout)
+
+    monkeypatch.setattr(app, "generate_pdf_resume", counting_render)
+    barrier = threading.Barrier(CONCURRENT_DOWNLOADS)
+
+    def download(_):
+        client = TestClient(app.app)
+        barrier.wait()
+        return client.get(f"/download_resume/{resume_id}")
+
+    with ThreadPoolExecutor(CONCURRENT_DOWNLOADS) as pool:
+        responses = list(pool.map(download, range(CONCURRENT_DOWNLOADS)))
+
+    assert [r.status_code for r in responses] == [200] * CONCURRENT_DOWNLOADS
+    # Every download got the complete file, not one still being written
+    assert all(r.content.startswith(b"%PDF") and r.content.rstrip().endswith(b"%%EOF") for r in responses)
+    assert len({r.content for r in responses}) == 1
+    assert len(renders) == 1 and renders[0] != pdf_path
+    assert not [name for name in os.listdir(os.path.dirname(pdf_path)) if name.endswith(".tmp")]
+
+
+def test_evict_runs_off_the_event_loop_and_pdfs_come_back(monkeypatch):
+    threads = []
+    evict = resume_store.evict_pdfs
+
+    def recording_evict(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return evict(*args, **kwargs)
+
+    monkeypatch.setattr(resume_store, "evict_pdfs", recording_evict)
+    with TestClient(app.app) as client:
+        admin = client.post("/admin/create", json={
+            "username": "evictor", "email": "evictor@example.com", "password": "correct horse battery",
+        }).json()["access_token"]
+        created = client.post("/generate_resume", json={
+            "name": "Alan Turing", "email": "alan@example.com", "template_style": "classic",
+        }).json()
+        evicted = client.post("/admin/pdf_cache/evict", params={"older_than_days": 0},
+                              headers={"Authorization": f"Bearer {admin}"})
+        assert evicted.status_code == 200 and evicted.json()["evicted"] >= 1
+        assert not os.path.exists(created["pdf_path"])
+
+        downloaded = client.get(f"/download_resume/{created['id']}")
+        assert downloaded.status_code == 200 and downloaded.content.startswith(b"%PDF")
+
+    # TestClient runs the event loop in this thread
+    assert threads and threading.current_thread() not in threads
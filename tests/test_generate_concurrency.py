@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+import app
+from database import Resume, SessionLocal, User
+
+CONCURRENT_REQUESTS = 8
+
+
+def _resume(email, i):
+    return {
+        "name": f"User {i}",
+        "email": email,
+        "title": "Engineer",
+        "experience": "Acme Corp - Engineer\n01/2020 - 12/2023",
+        "skills": "Python, SQL",
+        "template_style": "modern",
+    }
+
+
+def test_concurrent_first_submits_create_one_user():
+    email = "burst@example.com"
+    barrier = threading.Barrier(CONCURRENT_REQUESTS)
+
+    def submit(i):
+        # One client per thread: each request then runs on that thread's own
+        # event loop, so the requests really overlap, as in separate workers
+        client = TestClient(app.app, raise_server_exceptions=False)
+        barrier.wait()
+        return client.post("/generate_resume", json=_resume(email, i))
+
+    with TestClient(app.app):  # runs startup, which creates the schema
+        with ThreadPoolExecutor(CONCURRENT_REQUESTS) as pool:
+            responses = list(pool.map(submit, range(CONCURRENT_REQUESTS)))
+
+    assert [r.status_code for r in responses] == [200] * CONCURRENT_REQUESTS, [r.text for r in responses]
+    assert all("IntegrityError" not in r.text for r in responses)
+
+    db = SessionLocal()
+    try:
+        users = db.query(User).filter(User.email == email).all()
+        assert len(users) == 1
+        resumes = db.query(func.count(Resume.id)).filter(Resume.user_id == users[0].id).scalar()
+        assert resumes == CONCURRENT_REQUESTS
+        assert {r.json()["user_id"] for r in responses} == {users[0].id}
+    finally:
+        db.close()
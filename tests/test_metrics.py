@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from conftest import REPO_ROOT
+
+WORKER = textwrap.dedent("""
+    import sys
+    from metrics import ADMISSION_IN_FLIGHT, HTTP_REQUESTS, REGISTRY
+    REGISTRY.enable_multiprocess(sys.argv[1], interval=60)
+    HTTP_REQUESTS.inc("GET", "/healthz", "200", amount=int(sys.argv[2]))
+    ADMISSION_IN_FLIGHT.inc("render")
+    if sys.argv[3] == "scrape":
+        print(REGISTRY.render())
+""")
+
+
+def _worker(directory, requests, action="exit"):
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER, directory, str(requests), action],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": REPO_ROOT},
+    )
+    return {
+        line.rpartition(" ")[0]: float(line.rpartition(" ")[2])
+        for line in result.stdout.splitlines() if line and not line.startswith("#")
+    }
+
+
+def test_scrape_sums_workers_and_keeps_counts_of_exited_ones(tmp_path):
+    directory = str(tmp_path)
+    _worker(directory, 3)
+    _worker(directory, 4)
+
+    samples = _worker(directory, 5, "scrape")
+    requests = 'http_requests_total{method="GET",route="/healthz",status="200"}'
+    # Both exited workers' requests are kept; only the live worker's gauge counts
+    assert samples[requests] == 12
+    assert samples['admission_in_flight{endpoint_class="render"}'] == 1
+    assert not any("worker" in series for series in samples)
+    # Exited workers were folded into the archive; only the scraping worker's final file is left
+    names = sorted(os.listdir(directory))
+    assert names[:2] == ["archive.prom", "lock"] and len(names) == 3 and names[2].endswith(".dead")
+
+    assert _worker(directory, 0, "scrape")[requests] == 12
@@ -0,0 +1,80 @@
+import itertools
+import re
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from pdf_generator import render_resume
+from preview import PreviewCache
+from resume_layout import RESUME_SECTIONS, TEMPLATE_COLORS
+
+HEADINGS = {heading for _, heading, _ in RESUME_SECTIONS}
+STREAM = re.compile(rb"/Length (\d+)>>\s*stream\r?\n")
+TEXT = re.compile(rb"\((.*?)\) Tj")
+
+SECTION_TEXT = {
+    "summary": "Engineer focused on reliable backend systems.",
+    "experience": "Acme Corp - Engineer\n• Built APIs\n\nGlobex - Lead",
+    "education": "BSc Computer Science\n2014 - 2018",
+    "skills": "Python, SQL, Docker",
+    "languages": "English, German",
+    "certificates": "AWS Certified\n2021",
+}
+
+
+def _request(template_style, present):
+    fields = {field: (SECTION_TEXT[field] if field in present else "") for field in SECTION_TEXT}
+    return app.ResumeRequest(name="Ada Lovelace", email="ada@example.com", title="Engineer",
+                             website="ada.dev", template_style=template_style, **fields)
+
+
+def _pdf_headings(path):
+    data = open(path, "rb").read()
+    texts = []
+    for match in STREAM.finditer(data):
+        # Slice by /Length; compressed data may itself contain a line break
+        stream = data[match.end():match.end() + int(match.group(1))]
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        texts.extend(t.decode("latin-1") for t in TEXT.findall(stream))
+    return [t for t in texts if t in HEADINGS]
+
+
+def _html_headings(html):
+    return re.findall(r"<h2>(.*?)</h2>", html)
+
+
+# Every template, with all sections, none, and sections dropped at either end and in the middle
+CASES = list(itertools.product(
+    TEMPLATE_COLORS,
+    [tuple(SECTION_TEXT), (), ("experience",), ("summary", "skills", "certificates"), ("education", "languages")],
+))
+
+
+@pytest.mark.parametrize("template_style,present", CASES)
+def test_preview_sections_match_pdf_order(tmp_path, template_style, present):
+    request = _request(template_style, present)
+    path = str(tmp_path / "resume.pdf")
+    render_resume(request, path)
+
+    expected = [heading for field, heading, _ in RESUME_SECTIONS if field in present]
+    assert _pdf_headings(path) == expected
+    assert _html_headings(PreviewCache().render(request)) == expected
+
+
+def test_preview_endpoint_matches_layout():
+    request = _request("creative", tuple(SECTION_TEXT))
+    with TestClient(app.app) as client:
+        html = client.post("/preview_resume", json=request.dict())
+        layout = client.post("/preview_resume", params={"format": "json"}, json=request.dict())
+        bad = client.post("/preview_resume", params={"format": "pdf"}, json=request.dict())
+
+    assert html.status_code == 200 and html.headers["content-type"].startswith("text/html")
+    assert _html_headings(html.text) == [heading for _, heading, _ in RESUME_SECTIONS]
+    assert [section["field"] for section in layout.json()["sections"]] == [field for field, _, _ in RESUME_SECTIONS]
+    assert layout.json()["colors"]["primary"] == list(TEMPLATE_COLORS["creative"]["primary"])
+    assert bad.status_code == 400
@@ -0,0 +1,45 @@
+import os
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+import app
+import profiling
+
+
+def _admin_token(client, username):
+    response = client.post("/admin/create", json={
+        "username": username, "email": f"{username}@example.com", "password": "correct horse battery",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+def test_profiling_authorizer_accepts_only_unscoped_tokens_of_existing_admins():
+    with TestClient(app.app) as client:
+        token = _admin_token(client, "profiler")
+        link = client.post("/admin/export/users/link", headers={"Authorization": f"Bearer {token}"})
+    link_token = link.json()["url"].rpartition("link=")[2]
+
+    assert app.is_admin_token(token)
+    assert not app.is_admin_token(link_token)
+    assert not app.is_admin_token(app.create_access_token({"sub": "nobody"}, timedelta(minutes=5)))
+    assert not app.is_admin_token("not-a-jwt")
+
+
+def test_profile_includes_rendering_done_in_the_threadpool(tmp_path):
+    profiled_app = profiling.ProfilingMiddleware(app.app, authorize=lambda token: False,
+                                                 sample_rate=1.0, output_dir=str(tmp_path))
+    with TestClient(profiled_app) as client:
+        created = client.post("/generate_resume", json={
+            "name": "Barbara Liskov", "email": "barbara@example.com",
+            "experience": "MIT - Professor", "template_style": "modern",
+        })
+        os.remove(created.json()["pdf_path"])
+        downloaded = client.get(f"/download_resume/{created.json()['id']}")
+
+    for response in (created, downloaded):
+        assert response.status_code == 200
+        summary = profiling.profile_summary(
+            profiling.profile_path(response.headers["x-profile-id"], str(tmp_path)), limit=None)
+        assert "render_resume" in summary and "fpdf" in summary
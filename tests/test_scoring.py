@@ -0,0 +1,34 @@
+import app
+from resume_layout import resume_layout
+
+
+def _request(**fields):
+    base = {
+        "name": "Ada Lovelace",
+        "email": "ada@example.com",
+        "title": "Engineer",
+        "summary": "Backend engineer.",
+        "experience": "Acme Corp - Engineer\n\nGlobex - Senior Engineer\n\nInitech - Lead",
+        "education": "BSc Computer Science\n\nMSc Data Science",
+        "skills": "Python, SQL",
+        "languages": "English",
+        "certificates": "AWS Certified\n\nCKA",
+        "template_style": "modern",
+    }
+    base.update(fields)
+    return app.ResumeRequest(**base)
+
+
+def test_blank_separator_lines_keep_the_baseline_score():
+    # Blank lines between entries have always counted towards the score;
+    # sharing the parsed layout with the renderer must not change that
+    assert app.calculate_resume_score(_request()) == 69
+
+
+def test_score_is_the_same_with_a_precomputed_layout():
+    request = _request()
+    assert app.calculate_resume_score(request, resume_layout(request)) == app.calculate_resume_score(request)
+
+
+def test_whitespace_only_section_counts_as_one_line():
+    assert app.calculate_resume_score(_request(experience="   ")) == 69 - 25 + 5
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+from selenium.webdriver.common.keys import Keys
+
+from linkedin_scraper import ScraperEngine
+
+LOGIN_DELAY = 0.5
+
+
+class FakeElement:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def send_keys(self, text):
+        if text.endswith(Keys.RETURN):  # submits the login form
+            self.driver.current_url = "http://linkedin.test/feed/"
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for BrowserSession; logging in takes LOGIN_DELAY"""
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.quit_called = False
+
+    def get(self, url):
+        if url.endswith("/login"):
+            time.sleep(LOGIN_DELAY)
+        self.current_url = url
+
+    def find_element(self, by, value):
+        return FakeElement(self)
+
+    def execute_script(self, script):
+        return "complete"
+
+    @property
+    def page_source(self):
+        return f"<main>{self.current_url}</main>"
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _engine(pool_size, driver_factory=FakeDriver, timeout=5):
+    return ScraperEngine("me@example.com", "secret", pool_size=pool_size, base_url="http://linkedin.test",
+                         min_interval=0, timeout=timeout, driver_factory=driver_factory)
+
+
+def test_sessions_log_in_concurrently():
+    urls = [f"/in/user{i}" for i in range(3)]
+    engine = _engine(pool_size=3)
+    try:
+        start = time.monotonic()
+        pages = engine.fetch_many(urls)
+        elapsed = time.monotonic() - start
+    finally:
+        engine.close()
+    assert pages == {url: f"<main>http://linkedin.test{url}</main>" for url in urls}
+    # Three logins in parallel, not one after another behind the pool lock
+    assert elapsed < 2 * LOGIN_DELAY
+
+
+def test_slow_login_does_not_block_returning_sessions():
+    engine = _engine(pool_size=2)
+    try:
+        engine.fetch("/in/first")  # one warm session, now idle
+        engine._acquire()  # take it, so the next caller has to grow the pool
+        grower = threading.Thread(target=engine.fetch, args=("/in/second",))
+        grower.start()
+        time.sleep(LOGIN_DELAY / 5)  # the second session is now logging in
+        start = time.monotonic()
+        session = engine._sessions[0]
+        engine._release(session, healthy=False)
+        assert time.monotonic() - start < LOGIN_DELAY / 2
+        grower.join()
+    finally:
+        engine.close()
+
+
+def test_failed_session_creation_gives_the_slot_back():
+    attempts = []
+
+    def flaky_factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("browser failed to start")
+        return FakeDriver()
+
+    engine = _engine(pool_size=1, driver_factory=flaky_factory)
+    try:
+        with pytest.raises(RuntimeError, match="browser failed to start"):
+            engine.fetch("/in/someone")
+        assert engine.fetch("/in/someone") == "<main>http://linkedin.test/in/someone</main>"
+        assert engine._creating == 0 and len(engine._sessions) == 1
+    finally:
+        engine.close()
+
+
+def test_waiter_replaces_a_session_dropped_by_a_failed_fetch():
+    engine = _engine(pool_size=1, timeout=1)  # waiters give up after 4 s
+    try:
+        session = engine._acquire()
+        pages = []
+        waiter = threading.Thread(target=lambda: pages.append(engine.fetch("/in/waiting")))
+        waiter.start()
+        time.sleep(LOGIN_DELAY / 5)  # the waiter is now blocked on the full pool
+        start = time.monotonic()
+        engine._release(session, healthy=False)
+        waiter.join()
+        # Woken by the freed slot: one login, not the full wait
+        assert time.monotonic() - start < 2 * LOGIN_DELAY
+        assert pages == ["<main>http://linkedin.test/in/waiting</main>"]
+    finally:
+        engine.close()
+
+
+def test_full_pool_times_out_with_a_clear_error():
+    engine = _engine(pool_size=1, timeout=0.1)
+    try:
+        engine._acquire()
+        with pytest.raises(TimeoutError, match="No browser session became available"):
+            engine._acquire()
+    finally:
+        engine.close()
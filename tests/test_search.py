@@ -0,0 +1,98 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+import app
+import resume_store
+import search_index
+from database import SessionLocal
+
+SEEDED = 10
+
+
+def _submit(client, i, skills):
+    response = client.post("/generate_resume", json={
+        "name": f"Searcher {i}",
+        "email": f"searcher{i}@example.com",
+        "experience": "Platform engineering with Kubernetes",
+        "skills": skills,
+        "template_style": "modern",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _search(query):
+    db = SessionLocal()
+    try:
+        return search_index.search(db, query)["total"]
+    finally:
+        db.close()
+
+
+def test_rebuild_keeps_search_and_submits_working(monkeypatch):
+    with TestClient(app.app) as client:
+        for i in range(SEEDED):
+            _submit(client, i, "Python, Kubernetes")
+    baseline = _search("kubernetes")
+    assert baseline >= SEEDED
+
+    # Slow the rebuild down so searches and a submit land in the middle of it
+    started = threading.Event()
+    unpack = resume_store.unpack_resume
+
+    def slow_unpack(content):
+        started.set()
+        time.sleep(0.05)
+        return unpack(content)
+
+    monkeypatch.setattr(resume_store, "unpack_resume", slow_unpack)
+    results = {}
+
+    def rebuild():
+        db = SessionLocal()
+        try:
+            results["indexed"] = search_index.rebuild_index(db, batch_size=3)
+            results["rebuilt_at"] = time.monotonic()
+        finally:
+            db.close()
+
+    def submit_during_rebuild():
+        started.wait()
+        results["new_id"] = _submit(TestClient(app.app), SEEDED, "Python, Quuxlang")
+        results["submitted_at"] = time.monotonic()
+
+    rebuilder = threading.Thread(target=rebuild)
+    submitter = threading.Thread(target=submit_during_rebuild)
+    rebuilder.start()
+    submitter.start()
+    started.wait()
+    totals_during = []
+    while rebuilder.is_alive():
+        totals_during.append(_search("kubernetes"))
+    rebuilder.join()
+    submitter.join()
+
+    # Searches saw the old index throughout, never a missing or half-filled one
+    assert totals_during and set(totals_during) <= {baseline, baseline + 1}
+    assert results["indexed"] >= SEEDED
+    # The submit did not wait for the whole rebuild to release the write lock
+    assert results["submitted_at"] < results["rebuilt_at"]
+    # The resume submitted mid-rebuild is indexed exactly once
+    assert _search("quuxlang") == 1
+    assert _search("kubernetes") == baseline + 1
+
+
+def test_search_disabled_without_fts5(monkeypatch, caplog):
+    # Stand in for an SQLite build without FTS5: the probe asks for a module that is not there
+    monkeypatch.setattr(search_index, "FTS_MODULE", "fts_missing")
+    bind = create_engine("sqlite://")
+
+    assert not search_index.available(bind)
+    search_index.init_search_index(bind)
+    assert "/admin/search is disabled" in caplog.text
+    with bind.connect() as conn:
+        assert conn.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE name = :name"), {"name": search_index.FTS_TABLE}).scalar() == 0